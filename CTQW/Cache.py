@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+# both walks share one cache module: put the repository root on the path and stand in for Common.Cache,
+# so the Cache.default that enable() sets here is the one Core, Sweep and Scenarios consult
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from Common import Cache
+
+sys.modules[__name__] = Cache
@@ -1,23 +1,161 @@
 import numpy as np
 import scipy.sparse as sp
+import scipy.linalg as la
+import scipy.special as special
+import scipy.fft as fft
+import hashlib
+import os
+import warnings
+import Cache
 from typing import Sequence
 
+# precision name -> (real dtype, complex dtype)
+PRECISIONS = {"double": (np.float64, np.complex128), "single": (np.float32, np.complex64)}
+_SECULAR_SITES = 400     # chain length up to which defectSweep prefers the secular update at short times
+
+def _dtypes(precision: str):
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}")
+    return PRECISIONS[precision]
+
 class Hamiltonian:
-    def __init__(self, Num_sites: int):
+    def __init__(self, Num_sites: int, precision: str = "double"):
         self.N = Num_sites
-        main = 2.0 * np.ones(self.N)                   # main diagonal
-        off_diag = -1.0 * np.ones(self.N - 1)
+        self.precision = precision
+        # DIA layout: row 0 sub-diagonal, row 1 main diagonal, row 2 super-diagonal
+        self.bands = np.empty((3, self.N), dtype = _dtypes(precision)[0])
+        self.bands[0] = -1.0
+        self.bands[1] = 2.0
+        self.bands[2] = -1.0
+
+        self.diag = self.bands[1]                      # view, defects are written straight into it
+        self.defects: dict[int, float] = {}
+
+        self.absorber = np.zeros(self.N)               # absorbing potential W, H -> H - iW at the edges
 
-        self.Hamiltonian = np.diag(main, 0) + np.diag(off_diag, -1) + np.diag(off_diag, +1)
+        self._version = 0                              # bumped on every defect change
+        self._eigs = None
+
+        # shares memory with self.bands, so defect updates never copy the operator
+        self.Hamiltonian = sp.dia_array((self.bands, [-1, 0, 1]), shape = (self.N, self.N))
 
     def addDefects(self, def_sites: list[int], defect_str: list[float]):
-        Defected_Hamiltonian = self.Hamiltonian.copy().astype(complex)
         for site, strength in zip(def_sites, defect_str):
-            Defected_Hamiltonian[int(site), int(site)] += strength
-        self.Hamiltonian = Defected_Hamiltonian
+            site = int(site)
+            self.diag[site] += strength
+            self.defects[site] = self.defects.get(site, 0.0) + float(strength)
+        self._version += 1
+
+    def setDefects(self, def_sites: list[int], defect_str: list[float]):
+        for site, strength in zip(def_sites, defect_str):
+            site = int(site)
+            self.diag[site] = self._bare(site) + strength
+            self.defects[site] = float(strength)
+        self._version += 1
+
+    def removeDefects(self, def_sites: list[int]):
+        for site in def_sites:
+            site = int(site)
+            self.diag[site] = self._bare(site)
+            self.defects.pop(site, None)
+        self._version += 1
+
+    def addAbsorber(self, width: int, strength: float = 1.0):
+        """
+        Complex absorbing potential -iW on the outer `width` sites at both edges, with W rising
+        quadratically to `strength` at the walls. Norm lost there is reported by outflux().
+        """
+        profile = strength * ((width - np.arange(width)) / width)**2
+        self.absorber[:width] = profile
+        self.absorber[self.N - width:] = profile[::-1]
+
+        if not np.iscomplexobj(self.bands):
+            # one-off switch to complex bands, defects are still updated in place afterwards
+            self.bands = self.bands.astype(_dtypes(self.precision)[1])
+            self.diag = self.bands[1]
+            self.Hamiltonian = sp.dia_array((self.bands, [-1, 0, 1]), shape = (self.N, self.N))
+        self.diag.imag = -self.absorber
+        self._version += 1
+
+    @property
+    def absorbing(self) -> bool:
+        return bool(self.absorber.any())
+
+    def outflux(self, prob):
+        """
+        Rate 2 * sum W |psi|^2 at which probability leaves through the (left, right) absorbers, shape (..., 2).
+        """
+        rate = 2.0 * self.absorber * prob
+        half = self.N // 2
+        return np.stack([rate[..., :half].sum(axis = -1), rate[..., half:].sum(axis = -1)], axis = -1)
+
+    @property
+    def free(self) -> bool:
+        """
+        True for the bare open chain (2 on the diagonal, no defects or absorber), which the sine transform diagonalizes.
+        """
+        return not np.iscomplexobj(self.bands) and bool(np.all(self.diag == 2.0))
+
+    def freeEnergies(self):
+        # eigenvalues 2 - 2 cos(pi k / (N + 1)) of the DST-I modes sin(pi k j / (N + 1)), k = 1..N
+        k = np.arange(1, self.N + 1)
+        return 2.0 - 2.0 * np.cos(np.pi * k / (self.N + 1))
+
+    def copy(self):
+        """
+        Independent chain with its own bands, defects and absorber; the cached eigensystem is shared until either changes.
+        """
+        H = Hamiltonian.__new__(Hamiltonian)
+        H.N = self.N
+        H.precision = self.precision
+        H.bands = self.bands.copy()
+        H.diag = H.bands[1]
+        H.defects = dict(self.defects)
+        H.absorber = self.absorber.copy()
+        H._version = self._version
+        H._eigs = self._eigs
+        H.Hamiltonian = sp.dia_array((H.bands, [-1, 0, 1]), shape = (H.N, H.N))
+        return H
+
+    def fingerprint(self) -> str:
+        """
+        Short hash of the operator (size, precision, defects and absorber), used to match checkpoints to this chain.
+        """
+        digest = hashlib.sha256(np.int64(self.N).tobytes())
+        digest.update(np.ascontiguousarray(self.bands).tobytes())
+        return digest.hexdigest()[:16]
+
+    def _bare(self, site: int):
+        return 2.0 - 1j * self.absorber[site] if np.iscomplexobj(self.bands) else 2.0
+
+    def eigensystem(self):
+        """
+        Eigenpairs of the tridiagonal chain, computed once and reused until the defects change.
+        Returns (energies, modes) with modes[:, k] the k-th eigenvector.
+        """
+        if self.absorbing:
+            raise ValueError("Eigen-decomposition needs a Hermitian chain, this one has an absorber")
+        if self._eigs is None or self._eigs[0] != self._version:
+            energies, modes = la.eigh_tridiagonal(self.diag, self.bands[2, 1:])
+            self._eigs = (self._version, energies, modes)
+        return self._eigs[1], self._eigs[2]
+
+    def window(self, lo: int, hi: int):
+        """
+        Operator of the open sub-chain lo..hi-1, used by the adaptive evolver.
+        """
+        return sp.dia_array((self.bands[:, lo:hi], [-1, 0, 1]), shape = (hi - lo, hi - lo))
+
+    def spectralBounds(self):
+        """
+        Gershgorin interval (E_min, E_max) holding the whole spectrum, i.e. 2 +- 2 widened by the defects.
+        """
+        radius = np.abs(self.bands[0]).max() + np.abs(self.bands[2]).max()
+        return self.diag.real.min() - radius, self.diag.real.max() + radius
 
 class Wavefunction:
-    def __init__(self, gaussian: bool, Num_sites: int, center: int, spread: float = 15.0, momentum: float = 1.0 ):
+    def __init__(self, gaussian: bool, Num_sites: int, center: int, spread: float = 15.0, momentum: float = 1.0,
+                 precision: str = "double"):
         if gaussian:
             if momentum >= np.pi:
                 raise ValueError("Momentum can't be more than pi")
@@ -30,29 +168,565 @@ class Wavefunction:
             self.N = Num_sites
             self.psi = np.zeros(self.N, dtype = complex)
             self.psi[center] = 1.0 # Total Prob 1 at point
+        self.psi = self.psi.astype(_dtypes(precision)[1])
+
+def _site_prob(prob, site: int):
+    return prob[..., site]
+
+def _region_prob(prob, start: int, stop: int):
+    return prob[..., start:stop].sum(axis = -1)
+
+def _transmission(prob, site: int):
+    return prob[..., site:].sum(axis = -1)
+
+def _reflection(prob, site: int):
+    return prob[..., :site].sum(axis = -1)
+
+def _mean_position(prob):
+    x = np.arange(prob.shape[-1])
+    return (prob * x).sum(axis = -1) / prob.sum(axis = -1)
+
+def _variance(prob):
+    x = np.arange(prob.shape[-1])
+    mean = _mean_position(prob)
+    return (prob * (x - mean[..., None])**2).sum(axis = -1) / prob.sum(axis = -1)
+
+def _ipr(prob):
+    return (prob**2).sum(axis = -1) / prob.sum(axis = -1)**2
+
+def _absorbed(prob):
+    return 1.0 - prob.sum(axis = -1)
+
+# name -> f(probability, *args), evaluated on the last (site) axis so batches work unchanged
+OBSERVABLES = {
+    "site": _site_prob,
+    "region": _region_prob,
+    "transmission": _transmission,
+    "reflection": _reflection,
+    "mean_position": _mean_position,
+    "variance": _variance,
+    "ipr": _ipr,
+    "absorbed": _absorbed,
+}
+
+def _secular_poles(d, z):
+    """
+    Strength-independent part of the rank-one update of diag(d) + rho * z z^T: the components of z taking part,
+    the pole gaps d_k - d_j between them and the sums of log|d_k - d_j| over j != k used by Loewner's formula.
+    """
+    active = np.abs(z) > 1e-14 * np.abs(z).max()
+    dd = d[active]
+    gaps = dd[None, :] - dd[:, None]
+    log_gaps = np.log(np.abs(gaps + np.eye(dd.size))).sum(axis = 0)
+    return active, gaps, log_gaps
+
+def _model_root(c, q, s, b, finite):
+    """
+    Root between 0 and b of the two-pole model c + q / (0 - x) + s / (b - x) = 0, i.e. of
+    c x^2 - (c b + q + s) x + q b = 0, or of c x = q where there is no second pole (finite False).
+    """
+    B = c * b + q + s
+    big = B + np.copysign(np.sqrt(np.maximum(B**2 - 4.0 * c * q * b, 0.0)), B)
+    with np.errstate(divide = "ignore", invalid = "ignore"):
+        small = np.where(finite, 2.0 * q * b / big, q / c)
+        large = np.where(finite, big / (2.0 * c), q / c)
+    between = (small > np.minimum(0.0, b)) & (small < np.maximum(0.0, b)) | ~finite
+    return np.where(between, small, large)
+
+def _rank_one_update(d, z, rho, poles = None, iters: int = 100):
+    """
+    Eigen-decomposition of diag(d) + rho * z z^T for ascending d and unit z, without forming the eigenvectors.
+    Over the active components the j-th new eigenvector is z_hat / (d - mu_j) / norms[j], the others keep their eigenpair.
+    Returns (mu, active, z_hat, inv_delta, norms) with inv_delta[j, k] = 1 / (d_k - mu_j) on the active components.
+    poles = _secular_poles(d, z) can be passed in when the same d and z are updated with many strengths.
+    """
+    active, gaps, log_gaps = _secular_poles(d, z) if poles is None else poles
+    mu = d.copy()
+    if rho == 0.0:
+        return mu, active, z[active], None, None
+
+    eps = np.finfo(float).eps
+    # deflation: a component whose coupling rho z_k is below rounding keeps its eigenpair
+    keep = np.abs(rho * z[active]) > 8.0 * eps * max(np.abs(d).max(), abs(rho))
+    if not keep.all():
+        log_gaps = log_gaps[keep] - np.log(np.abs(gaps[np.ix_(~keep, keep)])).sum(axis = 0)
+        gaps = gaps[np.ix_(keep, keep)]
+        active = active.copy()
+        active[np.flatnonzero(active)[~keep]] = False
+    zz = z[active]
+    z2 = zz**2
+    m = zz.size
+    rows = np.arange(m)
+
+    # root j lies between pole j and its neighbour n_j (j + 1 for rho > 0, j - 1 for rho < 0); the outermost root
+    # has no neighbour and lies within rho |z|^2 of its pole
+    step_to = 1 if rho > 0 else -1
+    neighbour = rows + step_to
+    outer = (neighbour < 0) | (neighbour >= m)
+    neighbour = np.clip(neighbour, 0, m - 1)
+    width = np.where(outer, rho * z2.sum(), gaps[rows, neighbour])
+
+    # the sign of the secular function g(x) = 1/rho + sum z_k^2 / (d_k - d_o - x) at the middle of the interval
+    # tells which pole is nearer; measuring x from that pole (as LAPACK's dlaed4 does) keeps d_k - mu accurate
+    middle = 0.5 * width
+    g = 1.0 / rho + (z2 / (gaps - middle[:, None])).sum(axis = 1)
+    near_own = outer | ((g >= 0) == (rho > 0))
+    origin = np.where(near_own, rows, neighbour)
+    far = np.where(outer, np.inf, np.where(near_own, width, -width))     # the other pole, relative to the origin
+    mid = np.where(near_own, middle, -middle)         # the middle, relative to the origin
+    end = np.where(outer, width, mid)                 # the outer root lies within rho |z|^2 of its pole
+    lo, hi = np.minimum(0.0, end), np.maximum(0.0, end)
+    G = gaps[origin]                                  # d_k - d_o
+    # poles on the origin's side of the root, modelled together as q / (0 - x); the rest as s / (b - x)
+    own = G * np.sign(end)[:, None] <= 0
+
+    # initial guess from the two nearest poles with the rest frozen at the middle, as dlaed4 does
+    q, s = z2[origin], np.where(outer, 0.0, z2[np.where(near_own, neighbour, rows)])
+    b = np.where(outer, 0.0, far)
+    c = g + q / mid - np.where(outer, 0.0, s / (b - mid))
+    x = _model_root(c, q, s, b, ~outer)
+    x = np.where((x > lo) & (x < hi), x, 0.5 * (lo + hi))
+
+    todo = rows
+    for _ in range(iters):
+        inv = 1.0 / (G[todo] - x[todo, None])
+        inv2 = inv**2
+        g = 1.0 / rho + inv @ z2
+        slope = inv2 @ z2
+        own_slope = (inv2 * own[todo]) @ z2
+
+        t, b = x[todo], far[todo]
+        right = g < 0                                 # the secular function increases with x
+        lo[todo] = np.where(right, t, lo[todo])
+        hi[todo] = np.where(right, hi[todo], t)
+
+        # both pole models match value and slope at t ("middle way" of Bunch, Nielsen and Sorensen)
+        finite = np.isfinite(b)
+        b = np.where(finite, b, 0.0)
+        q = own_slope * t**2
+        s = np.where(finite, (slope - own_slope) * (b - t)**2, 0.0)
+        c = g + q / t - np.where(finite, s / np.where(finite, b - t, 1.0), 0.0)
+        guess = _model_root(c, q, s, b, finite)
+        # a model root outside the bracket falls back to bisection
+        ok = np.isfinite(guess) & (guess > lo[todo]) & (guess < hi[todo])
+        step = np.where(ok, guess, 0.5 * (lo[todo] + hi[todo]))
+
+        # converged only once g is zero to rounding (of g itself and of x through the slope) or the bracket
+        # has shrunk to the last bits of x; a stalled step is not convergence
+        noise = 8.0 * eps * (1.0 / abs(rho) + np.abs(inv) @ z2 + np.abs(t) * slope)
+        exact = np.abs(g) <= noise
+        bracket = hi[todo] - lo[todo]
+        done = exact | (bracket <= 4.0 * eps * np.maximum(np.abs(lo[todo]), np.abs(hi[todo])))
+        x[todo] = np.where(exact, t, step)
+        todo = todo[~done]
+        if todo.size == 0:
+            break
+
+    delta = G - x[:, None]                            # d_k - mu_j, indexed [j, k]
+
+    # Loewner's formula rebuilds z from the computed roots so the vectors stay orthogonal
+    log_z2 = np.sum(np.log(np.abs(delta)), axis = 0) - log_gaps - np.log(abs(rho))
+    z_hat = np.sign(zz) * np.exp(0.5 * log_z2)
+
+    inv_delta = 1.0 / delta
+    norms = np.sqrt((z_hat**2 * inv_delta**2).sum(axis = 1))
+    mu[active] = d[active][origin] + x
+    return mu, active, z_hat, inv_delta, norms
 
 class Evolver:
-    def __init__(self, Hamiltonian, Wavefunction):
+    def __init__(self, Hamiltonian, Wavefunction, method: str = "auto", tol: float = 1e-12,
+                 adaptive: bool = False, threshold: float = 1e-12, margin: int = 20,
+                 precision: str = None, check_every: int = 0, drift_tol: float = 1e-4,
+                 checkpoint: str = None, checkpoint_every: int = 10):
+        # "auto" uses the exact sine transform on the defect-free chain and expm otherwise
+        if method not in ("auto", "expm", "spectral", "chebyshev", "dst"):
+            raise ValueError(f"Unknown evolution method {method!r}")
+        if adaptive and method in ("spectral", "dst"):
+            raise ValueError("Adaptive windows need the expm or chebyshev backend")
+
         self.Hamiltonian = Hamiltonian
         self.Wavefunction = Wavefunction
+        self.method = method
+        self.tol = tol                                 # truncation error of the chebyshev series
+
+        # adaptive mode only evolves sites with |psi| > threshold plus a margin that follows the wavefront
+        self.adaptive = adaptive
+        self.threshold = threshold
+        self.margin = margin
+
+        if isinstance(Wavefunction, (list, tuple)):
+            # batch of initial states stored as columns, shape (N, B)
+            self.psi = np.stack([getattr(wf, "psi") for wf in Wavefunction], axis = 1)
+        else:
+            self.psi = getattr(Wavefunction, "psi")
+        self.batched = self.psi.ndim == 2
+
+        # "single" runs in complex64 / float32 (None follows the initial state), every check_every-th
+        # snapshot of a single-precision run is recomputed in double from the previous one and the
+        # discrepancy is logged in self.drift as (t, accumulated norm drift, relative step error)
+        if precision is None:
+            precision = "single" if self.psi.dtype == np.complex64 else "double"
+        self.precision = precision
+        self.real, self.complex = _dtypes(precision)
+        self.psi = self.psi.astype(self.complex, copy = False)
+        self.check_every = check_every
+        self.drift_tol = drift_tol
+        self.drift = []
+        self._reference = None
+
+        # streamed runs save the state to the directory `checkpoint` every checkpoint_every snapshots and at the end,
+        # one compressed npz per (chain, initial state, precision); stream/run(resume = True) pick it up again
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.resumed_from = None
+
+    @property
+    def H(self):
+        return self._cast(getattr(self.Hamiltonian, "Hamiltonian"))
+
+    def _cast(self, op):
+        # operators follow the evolver precision so products never silently upcast the state
+        dtype = self.complex if np.iscomplexobj(op) else self.real
+        return op if op.dtype == dtype else op.astype(dtype)
 
-        self.H = getattr(Hamiltonian, "Hamiltonian")
-        self.psi = getattr(Wavefunction, "psi")
+    @property
+    def monitored(self) -> bool:
+        return self.precision == "single" and self.check_every > 0
 
-    def run(self, times):
+    @property
+    def backend(self) -> str:
+        if self.method == "auto":
+            return "dst" if self.Hamiltonian.free else "expm"
+        return self.method
+
+    def run(self, times, resume: bool = False):
+        """
+        Returns (vectors, probability) of shape (nt, N), or (B, nt, N) for a batch of B initial states.
+        With resume = True the run restarts from the latest compatible checkpoint, and only the times
+        at or after it (from self.resumed_from on) are returned.
+        Once Cache.enable() was called, finished runs are stored and identical ones are read back instead.
+        """
         times = np.asarray(times)
         if times.ndim != 1 or times.size == 0:
             raise ValueError("Boy that times better be an array")
 
-        nt = times.size
+        cache = None if resume else Cache.default
+        if cache is not None:
+            cache_key = Cache.key("ctqw", self.Hamiltonian.fingerprint(), self.psi, times, self.precision,
+                                  self.backend, self.tol, self.adaptive, self.threshold, self.margin)
+            vectors = cache.get(cache_key)
+            if vectors is not None:
+                return vectors, np.abs(vectors)**2
 
-        vectors = sp.linalg.expm_multiply(-1j * self.H, self.psi, start = times[0], stop = times[-1], num = nt)
+        backend = self.backend
+        if backend == "chebyshev" or self.adaptive or self.monitored or self.checkpoint is not None:
+            vectors = np.stack([vector for _, vector, _ in self.stream(times, resume = resume)], axis = -2)
+        elif backend == "dst":
+            vectors = self._dst(times)
+        elif backend == "spectral":
+            vectors = self._spectral(times)
+        else:
+            vectors = self._interval(self.H, times)
 
         vectors = np.asarray(vectors)
         probability = np.abs(vectors)**2
+        if cache is not None:
+            cache.put(cache_key, vectors)
+
+        return vectors, probability
+
+    def stream(self, times, resume: bool = False):
+        """
+        Yields (time, vector, probability) one snapshot at a time, keeping only the current state in memory.
+        times must be non-decreasing and are measured from the initial state at t = 0.
+        With resume = True evolution starts from the latest compatible checkpoint not beyond times[-1]
+        and the times before it are skipped.
+        """
+        times = np.asarray(times)
+        if times.ndim != 1 or times.size == 0:
+            raise ValueError("Boy that times better be an array")
+        if np.any(np.diff(times) < 0):
+            raise ValueError("Streaming needs non-decreasing times")
+
+        psi = self.psi
+        t_prev = 0.0
+        saved = self._load_checkpoint()
+        self.resumed_from = None
+        if resume and saved is not None and saved[0] <= times[-1]:
+            t_prev, psi = saved
+            times = times[times >= t_prev]
+            self.resumed_from = t_prev
+        t_saved = saved[0] if saved is not None else -np.inf
+
+        for i, t in enumerate(times):
+            prev, psi = psi, self._propagate(psi, t - t_prev)
+            if self.monitored and i % self.check_every == 0:
+                self._check(t, prev, psi, t - t_prev)
+            t_prev = t
+
+            # never replace a checkpoint with an earlier state
+            last = i == times.size - 1
+            if self.checkpoint is not None and t > t_saved and (last or (i + 1) % self.checkpoint_every == 0):
+                self._save_checkpoint(t, psi)
+                t_saved = t
+
+            vector = psi.T if self.batched else psi
+            yield t, vector, np.abs(vector)**2
+
+    def finalState(self, t_max: float, region: tuple = None, tol: float = 1e-8, check: float = 1.0):
+        """
+        Evolve straight to t_max without keeping the intermediate states.
+        With region = (lo, hi) around the scatterer the state is inspected every `check` time units and the
+        evolution stops early once the packet has been through the region and left it: less than tol of the
+        probability inside and the reflected (sites < lo) and transmitted (sites >= hi) parts changing by less than tol.
+        Returns (vector, probability, t) with t the time actually reached; a batch stops when all its states have.
+        """
+        if region is None:
+            times = np.array([t_max], dtype = float)
+        else:
+            times = np.append(np.arange(check, t_max, check), t_max)
+
+        entered = False
+        sides = None
+        for t, vector, prob in self.stream(times):
+            if region is None:
+                break
+            lo, hi = region
+            inside = _region_prob(prob, lo, hi).max()
+            previous, sides = sides, np.stack([_reflection(prob, lo), _transmission(prob, hi)], axis = -1)
+            entered = entered or inside > tol
+            if entered and inside < tol and previous is not None and np.abs(sides - previous).max() < tol:
+                break
+
+        return vector, prob, t
+
+    def observe(self, times, observables):
+        """
+        Evaluate observables inside the propagation loop instead of storing every amplitude.
+        observables: list of names from OBSERVABLES or tuples (name, *args), e.g. [("site", 150), "ipr"]
+        Returns an array of shape (nt, n_observables), or (B, nt, n_observables) for a batch.
+        """
+        specs = [(obs,) if isinstance(obs, str) else tuple(obs) for obs in observables]
+        for spec in specs:
+            if spec[0] not in OBSERVABLES:
+                raise ValueError(f"Unknown observable {spec[0]!r}")
+
+        times = np.asarray(times)
+        shape = (self.psi.shape[1], times.size) if self.batched else (times.size,)
+        values = np.empty(shape + (len(specs),))
+        for i, (_, _, prob) in enumerate(self.stream(times)):
+            for j, (name, *args) in enumerate(specs):
+                values[..., i, j] = OBSERVABLES[name](prob, *args)
+
+        return values
+
+    def _checkpoint_path(self):
+        digest = hashlib.sha256(self.Hamiltonian.fingerprint().encode())
+        digest.update(np.ascontiguousarray(self.psi).tobytes())
+        return os.path.join(self.checkpoint, f"ctqw_{digest.hexdigest()[:16]}.npz")
+
+    def _load_checkpoint(self):
+        """
+        (t, psi) from this run's checkpoint file, or None if there is none yet.
+        """
+        if self.checkpoint is None or not os.path.exists(self._checkpoint_path()):
+            return None
+        with np.load(self._checkpoint_path()) as data:
+            if str(data["fingerprint"]) != self.Hamiltonian.fingerprint() or data["psi"].shape != self.psi.shape:
+                return None
+            return float(data["t"]), data["psi"].astype(self.complex)
+
+    def _save_checkpoint(self, t, psi):
+        # written next to the target and renamed, so a killed job never leaves a truncated checkpoint
+        path = self._checkpoint_path()
+        os.makedirs(self.checkpoint, exist_ok = True)
+        tmp = path[:-len(".npz")] + ".tmp.npz"
+        np.savez_compressed(tmp, psi = psi, t = t, fingerprint = self.Hamiltonian.fingerprint())
+        os.replace(tmp, path)
+
+    def _check(self, t, prev, psi, dt):
+        """
+        Redo the step prev -> psi in double precision and log how far the single-precision result strayed.
+        The reference always uses an exact backend (dst on the free chain, expm otherwise) on the full lattice.
+        """
+        if self._reference is None:
+            self._reference = Evolver(self.Hamiltonian, self.Wavefunction,
+                                      method = "dst" if self.backend == "dst" else "expm", precision = "double")
+            self._norm_drift = 0.0
+        ref = self._reference._propagate(prev.astype(np.complex128), dt)
+
+        norm_ref = np.linalg.norm(ref, axis = 0)
+        self._norm_drift += np.max(np.abs(np.linalg.norm(psi, axis = 0)**2 - norm_ref**2))
+        error = np.max(np.linalg.norm(psi - ref, axis = 0) / norm_ref)
+        self.drift.append((float(t), float(self._norm_drift), float(error)))
+        if error > self.drift_tol or self._norm_drift > self.drift_tol:
+            warnings.warn(f"Single-precision drift at t = {t}: norm {self._norm_drift:.2e}, step error {error:.2e}")
+
+    def _propagate(self, psi, dt):
+        dt = float(dt)
+        if dt == 0:
+            return psi
+        if self.adaptive:
+            return self._windowed(psi, dt)
+        backend = self.backend
+        if backend == "dst":
+            if not self.Hamiltonian.free:
+                raise ValueError("The dst backend only applies to the defect-free chain")
+            phases = np.exp(-1j * dt * self.Hamiltonian.freeEnergies()).astype(self.complex)
+            coeffs = fft.dst(psi, type = 1, norm = "ortho", axis = 0)
+            return fft.dst((phases * coeffs.T).T, type = 1, norm = "ortho", axis = 0)
+        if backend == "spectral":
+            energies, modes = self.Hamiltonian.eigensystem()
+            phases = np.exp(-1j * dt * energies).astype(self.complex)
+            modes = modes.astype(self.real, copy = False)
+            return modes @ (phases * (modes.T @ psi).T).T
+        return self._step(psi, dt, self.H)
+
+    def _interval(self, H, times):
+        # the interval form of expm_multiply works in double precision whatever the input dtype
+        if times.size == 1:
+            vectors = sp.linalg.expm_multiply(-1j * times[0] * H, self.psi)[None]
+        else:
+            vectors = sp.linalg.expm_multiply(-1j * H, self.psi, start = times[0], stop = times[-1], num = times.size)
+        vectors = vectors.astype(self.complex, copy = False)
+        return np.moveaxis(vectors, -1, 0) if self.batched else vectors
+
+    def _step(self, psi, dt, H):
+        if self.backend == "chebyshev":
+            return self._chebyshev(psi, dt, H)
+        return sp.linalg.expm_multiply(-1j * dt * H, psi)
+
+    def _windowed(self, psi, dt):
+        # amplitude beyond distance d of the support is ~ (e dt / d)^d, so start with a margin of e * dt
+        N = self.Hamiltonian.N
+        amplitude = np.abs(psi).max(axis = 1) if self.batched else np.abs(psi)
+        support = np.flatnonzero(amplitude > self.threshold)
+        if support.size == 0:
+            return self._step(psi, dt, self.H)
+
+        margin = self.margin + int(np.ceil(np.e * dt))
+        while True:
+            lo = max(support[0] - margin, 0)
+            hi = min(support[-1] + margin + 1, N)
+            window = self._step(psi[lo:hi], dt, self._cast(self.Hamiltonian.window(lo, hi)))
+
+            # the window edges act as hard walls, widen and redo the step if the front reached them
+            edge = 0.0
+            if lo > 0:
+                edge += np.abs(window[:4]).sum()
+            if hi < N:
+                edge += np.abs(window[-4:]).sum()
+            if edge <= self.threshold or (lo == 0 and hi == N):
+                break
+            margin *= 2
+
+        result = np.zeros_like(psi)
+        result[lo:hi] = window
+        return result
+
+    def _chebyshev(self, psi, dt, H):
+        # exp(-i H dt) = exp(-i a dt) sum_k c_k T_k((H - a) / b) with c_k = (2 - delta_k0) (-i)^k J_k(b dt)
+        if self.Hamiltonian.absorbing:
+            raise ValueError("The chebyshev backend needs a Hermitian chain, use expm with an absorber")
+        e_min, e_max = self.Hamiltonian.spectralBounds()
+        a = float(0.5 * (e_max + e_min))
+        b = float(0.5 * (e_max - e_min))
+
+        # J_k(x) decays super-exponentially once k > x, so cut the series where it drops below tol
+        x = b * dt
+        k = np.arange(int(x + 10 * np.cbrt(x) + 20))
+        coeffs = 2.0 * (-1j)**k * special.jv(k, x)
+        coeffs[0] /= 2.0
+        # terms below the resolution of float32 are pointless in single precision
+        tol = self.tol if self.precision == "double" else max(self.tol, 1e-8)
+        n_terms = max(np.flatnonzero(np.abs(coeffs) > tol).max() + 1, 2)
+        coeffs = coeffs.astype(self.complex)
+
+        def scaled(v):
+            return (H @ v - a * v) / b
+
+        prev, cur = psi, scaled(psi)
+        result = coeffs[0] * prev + coeffs[1] * cur
+        for c in coeffs[2:n_terms]:
+            prev, cur = cur, 2.0 * scaled(cur) - prev
+            result += c * cur
+
+        return complex(np.exp(-1j * a * dt)) * result
+
+    def defectSweep(self, site: int, strengths, times, sites = None, method: str = "auto"):
+        """
+        Evolve the same initial state for a whole range of defect strengths added at one site.
+        "secular" treats the defect as a rank-one update of the cached eigensystem of self.Hamiltonian, so only
+        the secular equation is solved per strength; that is O(N^2) per strength and pays off on short chains or
+        long times. "expm" evolves every strength on its own, O(N ||H|| t) each. "auto" picks the cheaper one.
+        sites limits the amplitudes returned (e.g. the defect site or the transmitted side) and the work to rebuild them.
+        Returns (vectors, probability) with shapes (n_strengths, nt, n_sites), or (n_strengths, B, nt, n_sites)
+        for a batch, n_sites = N without sites.
+        """
+        times = np.asarray(times)
+        strengths = np.asarray(strengths, dtype = float)
+        if times.ndim != 1 or times.size == 0:
+            raise ValueError("Boy that times better be an array")
+        if method not in ("auto", "secular", "expm"):
+            raise ValueError(f"Unknown sweep method {method!r}")
+        sites = np.arange(self.Hamiltonian.N) if sites is None else np.atleast_1d(np.asarray(sites, dtype = int))
+
+        if method == "auto":
+            # a few passes over the N x N secular system against a Krylov evolution of ~ ||H|| t matvecs per site
+            E_min, E_max = self.Hamiltonian.spectralBounds()
+            span = (E_max - E_min) * np.abs(times).max()
+            method = "secular" if self.Hamiltonian.N <= _SECULAR_SITES + span else "expm"
+
+        shape = self.psi.shape[1:] + (times.size, sites.size)
+        vectors = np.empty((strengths.size,) + shape, dtype = self.complex)
+        if method == "expm":
+            for i, strength in enumerate(strengths):
+                H = self.Hamiltonian.copy()
+                H.addDefects([int(site)], [strength])
+                vectors[i] = self._interval(self._cast(H.Hamiltonian), times)[..., sites]
+            return vectors, np.abs(vectors)**2
+
+        energies, modes = self.Hamiltonian.eigensystem()
+        z = modes[int(site), :]
+        coeffs = modes.T @ self.psi
+        poles = _secular_poles(energies, z)
+        rows = modes[sites]
+
+        # eigen-coefficients over (..., nt, mode), the modes without weight on the site just pick up their phase
+        free = np.exp(-1j * np.outer(times, energies)) * coeffs.T[..., None, :]
+        for i, strength in enumerate(strengths):
+            mu, active, z_hat, inv_delta, norms = _rank_one_update(energies, z, strength, poles)
+            if inv_delta is None:
+                vectors[i] = free @ rows.T
+                continue
+            # new mode j is z_hat / (d - mu_j) / norms[j] over the active old modes: its amplitude on the sites
+            # and its overlap with psi both go through the Cauchy matrix, the full N-vectors are never formed
+            on_sites = (rows[:, active] * z_hat) @ inv_delta.T / norms
+            a = (coeffs[active].T * z_hat) @ inv_delta.T / norms
+            phases = np.exp(-1j * np.outer(times, mu[active]))
+            vectors[i] = free[..., ~active] @ rows[:, ~active].T + (phases * a[..., None, :]) @ on_sites.T
+
+        probability = np.abs(vectors)**2
 
         return vectors, probability
 
+    def _dst(self, times):
+        # DST-I is orthonormal and its own inverse: psi(t) = S exp(-i E t) S psi
+        if not self.Hamiltonian.free:
+            raise ValueError("The dst backend only applies to the defect-free chain")
+        energies = self.Hamiltonian.freeEnergies()
+        coeffs = fft.dst(self.psi, type = 1, norm = "ortho", axis = 0)
+        phases = np.exp(-1j * np.outer(times, energies)).astype(self.complex)
+        return fft.dst(phases * coeffs.T[..., None, :], type = 1, norm = "ortho", axis = -1)
+
+    def _spectral(self, times):
+        # psi(t) = V exp(-i E t) V^T psi, times need not be uniform
+        energies, modes = self.Hamiltonian.eigensystem()
+        modes = modes.astype(self.real, copy = False)
+        coeffs = modes.T @ self.psi
+        phases = np.exp(-1j * np.outer(times, energies)).astype(self.complex)
+        return (phases * coeffs.T[..., None, :]) @ modes.T
+
     # @staticmethod
     # def region_prob_double(vectors: np.ndarray, site0: int, site1: int, buffer: int):
     #     probs = Evolver.probability(vectors)
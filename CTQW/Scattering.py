@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def coefficients(k, def_sites, defect_str):
+    """
+    Exact stationary transmission and reflection of the chain H = 2 - hopping with point defects,
+    for a plane wave e^{i k n} (0 < k < pi, energy E = 2 - 2 cos k) coming in from the left.
+
+    k:          wavenumbers, any shape K
+    def_sites:  defect positions (m,)
+    defect_str: defect strengths (..., m), a leading shape sweeps several defect configurations at once
+    Returns (T, R), each of shape (...,) + K, with T + R = 1.
+
+    Between defects the solution is A e^{i k n} + B e^{-i k n}, and psi_{n+1} = (2 + V_n - E) psi_n - psi_{n-1}
+    carries (A, B) across a defect at s with Q_s = 1 + V / (2i sin k) [[1, e^{-2iks}], [-e^{2iks}, -1]],
+    so the cost is O(m) per k and strength.
+    """
+    k = np.asarray(k, dtype = float)
+    sites = np.asarray(def_sites, dtype = float)
+    strengths = np.asarray(defect_str, dtype = float)
+    if strengths.shape[-1:] != sites.shape:
+        raise ValueError("Need one defect strength per defect site")
+
+    # broadcast to (..., K, 2, 2) with the k axes after the strength axes
+    k_axes = (None,) * k.ndim
+    lead = strengths.shape[:-1]
+    M = np.broadcast_to(np.eye(2, dtype = complex), lead + k.shape + (2, 2)).copy()
+
+    order = np.argsort(sites)
+    for j in order:
+        c = strengths[(..., j) + k_axes] / (2j * np.sin(k))
+        phase = np.exp(2j * k * sites[j])
+        Q = np.empty(M.shape, dtype = complex)
+        Q[..., 0, 0] = 1.0 + c
+        Q[..., 0, 1] = c / phase
+        Q[..., 1, 0] = -c * phase
+        Q[..., 1, 1] = 1.0 - c
+        M = Q @ M
+
+    # incoming 1 and reflected r on the left, transmitted t only on the right: (t, 0) = M (1, r)
+    r = -M[..., 1, 0] / M[..., 1, 1]
+    t = 1.0 / M[..., 1, 1]            # det M = 1
+    return np.abs(t)**2, np.abs(r)**2
+
+
+def fromHamiltonian(Hamiltonian, k):
+    """
+    (T, R) at wavenumbers k for the defects recorded on a Core.Hamiltonian.
+    """
+    if Hamiltonian.absorbing:
+        raise ValueError("Stationary scattering needs a chain without absorber")
+    sites = list(Hamiltonian.defects)
+    return coefficients(k, sites, [Hamiltonian.defects[s] for s in sites])
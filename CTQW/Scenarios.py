@@ -0,0 +1,65 @@
+import numpy as np
+import Cache  # puts the repository root, home of the shared Common package, on the import path
+import Core
+import Plotting
+from Common import Scenarios
+
+
+def load(path: str):
+    """
+    Scenario list from a JSON or TOML file (by extension) with a top-level "scenario" array, e.g.
+
+        [[scenario]]
+        name = "Reflection_Delta"
+        N = 1001
+        times = {t_max = 300}
+        walks = [{defects = {sites = [], strengths = []}, state = {gaussian = false, center = 400}},
+                 {defects = {sites = [600], strengths = [1.0]}, state = {gaussian = false, center = 400}}]
+        stages = [{kind = "prob", ylim = 0.1}]
+
+    defects may also carry absorber = {width, strength}; state takes the Core.Wavefunction keywords;
+    times are {t_max, num} with num = t_max + 1 by default.
+    """
+    return Scenarios.load(path)
+
+
+def plan(scenarios):
+    """
+    Common.Scenarios.plan with the defects keyed on their per-site strengths.
+    """
+    return Scenarios.plan(scenarios, "strengths")
+
+
+def buildHamiltonian(N: int, spec: dict):
+    H = Core.Hamiltonian(N)
+    if spec.get("sites"):
+        H.addDefects(spec["sites"], spec["strengths"])
+    if "absorber" in spec:
+        H.addAbsorber(**spec["absorber"])
+    return H
+
+
+def buildState(N: int, spec: dict):
+    return Core.Wavefunction(Num_sites = N, **spec)
+
+
+def _prob_stage(name, times, vectors, probs, ylim: float = 0.1):
+    Plotting.ProbDistAnimate(np.stack(probs), times, name, ylim)
+
+def _momentum_stage(name, times, vectors, probs):
+    Plotting.MomentumDistAnimate(np.stack(vectors), times, name + "_Momentum")
+
+# stage kind -> f(name, times, vectors, probabilities, **options), one entry of each list per walk
+STAGES = {
+    "prob": _prob_stage,
+    "momentum": _momentum_stage,
+}
+
+
+def run(scenarios, workers: int = None, stages: bool = True):
+    """
+    Common.Scenarios.run with the CTQW builders and STAGES: every unique Hamiltonian, initial state and
+    evolution is computed once. Returns {name: {"times", "vectors", "probability"}}.
+    """
+    return Scenarios.run(scenarios, "strengths", Core.Evolver, buildHamiltonian, buildState, STAGES, workers,
+                         stages)
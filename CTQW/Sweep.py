@@ -0,0 +1,25 @@
+import copy
+import Cache  # puts the repository root, home of the shared Common package, on the import path
+from Common import Sweep
+from Common.Sweep import gridPoints, refine
+
+# array attributes of Hamiltonian / Wavefunction that travel through shared memory instead of pickles
+_SHARED = {"Hamiltonian": ("bands", "absorber"), "Wavefunction": ("psi",)}
+
+
+def _skeleton(H):
+    # the operator and caches are derived from the bands, copy() rebuilds them on the worker
+    H = copy.copy(H)
+    H.diag = None
+    H.Hamiltonian = None
+    H._eigs = None
+    return H
+
+
+def sweep(evaluate, grid, Hamiltonian, Wavefunction, workers: int = None, chunksize: int = 1):
+    """
+    Common.Sweep.sweep for the CTQW: the base bands and initial state are placed in shared memory once
+    instead of being pickled per task. Returns (results, timing).
+    """
+    return Sweep.sweep(evaluate, grid, Hamiltonian, Wavefunction, _SHARED, _skeleton, "ctqw-sweep", workers,
+                       chunksize)
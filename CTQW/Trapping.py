@@ -0,0 +1,71 @@
+import numpy as np
+import scipy.linalg as la
+
+
+def _decomposition(Hamiltonian):
+    """
+    H = V diag(E) V^-1 for the chain: the cached Hermitian eigensystem, or with an absorber the complex
+    energies of H - iW, whose modes decay as |e^{-i E t}|^2 = e^{2 Im(E) t}.
+    Returns (energies, V, V_inv).
+    """
+    if not Hamiltonian.absorbing:
+        energies, modes = Hamiltonian.eigensystem()
+        return energies, modes, modes.T
+    energies, V = la.eig(Hamiltonian.Hamiltonian.toarray())
+    return energies, V, la.inv(V)
+
+
+def boundModes(Hamiltonian, region: tuple, threshold: float = 0.5):
+    """
+    Eigenmodes of the chain holding more than `threshold` of their (normalized) probability inside
+    region = (lo, hi), i.e. the bound and quasi-bound states of a trap. With an absorber quasi-bound
+    modes leak through the defects and have Im(E) < 0, bound ones keep a real energy.
+    Returns (indices, energies, weights) with indices into the modes of the decomposition.
+    """
+    lo, hi = region
+    energies, V, _ = _decomposition(Hamiltonian)
+    weights = (np.abs(V[lo:hi])**2).sum(axis = 0) / (np.abs(V)**2).sum(axis = 0)
+    indices = np.flatnonzero(weights > threshold)
+    return indices, energies[indices], weights[indices]
+
+
+def trappedProbability(Hamiltonian, Wavefunction, region: tuple, times = None, threshold: float = 0.5,
+                       decay_tol: float = 1e-6, degeneracy: float = 1e-9):
+    """
+    Probability inside region = (lo, hi) from the overlaps c = V^-1 psi of the initial state with every mode
+    instead of a long-time evolution. With P the projector on the region,
+
+        P_trap(t) = sum_{k,l} c_k c_l^* e^{-i (E_k - E_l^*) t} <v_l|P|v_k>
+
+    whose time average keeps the pairs with E_k = E_l (within `degeneracy`) among the modes that do not
+    decay (|Im E| within decay_tol). On the closed chain that is every mode, and the escaped part keeps
+    crossing the region and counts with its share of it; add an absorber to the Hamiltonian for the
+    probability an open trap keeps, to which only its truly bound modes contribute.
+    Returns a dict with
+        "average":  infinite-time average of the probability inside the region
+        "initial":  the bound and quasi-bound modes' share of the region at t = 0
+        "curve":    P_trap at `times` (None without times)
+        "modes", "energies", "weights", "overlaps": the modes as found by boundModes() and their overlaps
+    """
+    lo, hi = region
+    indices, _, weights = boundModes(Hamiltonian, region, threshold)
+    energies, V, V_inv = _decomposition(Hamiltonian)
+    inside = V[lo:hi]
+    overlaps = V_inv @ Wavefunction.psi.astype(complex)
+
+    survives = np.abs(energies.imag) <= decay_tol
+    kept = np.flatnonzero(survives)
+    same = np.abs(energies[kept, None] - energies[None, kept]) < degeneracy
+    gram = inside[:, kept].conj().T @ inside[:, kept]
+    average = np.real(overlaps[kept].conj() @ (same * gram) @ overlaps[kept])
+
+    bound = inside[:, indices] * overlaps[indices]
+    initial = (np.abs(bound.sum(axis = 1))**2).sum()
+
+    curve = None
+    if times is not None:
+        phases = np.exp(-1j * np.asarray(times, dtype = float)[:, None] * energies) * overlaps
+        curve = (np.abs(phases @ inside.T)**2).sum(axis = -1)
+
+    return {"average": average, "initial": initial, "curve": curve,
+            "modes": indices, "energies": energies[indices], "weights": weights, "overlaps": overlaps[indices]}
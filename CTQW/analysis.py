@@ -1,32 +1,33 @@
 import numpy as np
 import matplotlib.pyplot as plt
+import Cache
 import Core
 import Plotting
+import Scattering
+import Sweep
+import Trapping
+import scipy.linalg as la
 from pathlib import Path
-from tqdm import tqdm
 
 
 def defect_str_origin():
     N = 201
     center = 150
     t_max = 30
-    times = np.linspace(0, t_max, t_max + 1, dtype = int)
     dir = Path("PlotAnalysis")
     dir.mkdir(parents = True, exist_ok = True)
     path = dir / "Defect_Origin.png"
 
-    defect_range = np.linspace(-15, 15, 60)
-    prob_origin = []
-
-    for defect in tqdm(defect_range, desc = "Origin Strength Test"):
-        H_defected = Core.Hamiltonian(N)
-        H_defected.addDefects([center], [defect])
+    H = Core.Hamiltonian(N)
+    Psi = Core.Wavefunction(gaussian = False, Num_sites= N, center = center)
+    Evo = Core.Evolver(H, Psi)
 
-        Psi = Core.Wavefunction(gaussian = False, Num_sites= N, center = center)
-        Evo = Core.Evolver(H_defected, Psi)
+    def origin(strengths):
+        _, prob = Evo.defectSweep(center, strengths, [t_max], sites = [center])
+        return prob[:, -1, 0]
 
-        _, prob = Evo.run(times)
-        prob_origin.append(prob[-1][center])
+    # coarse grid in [-15, 15], refined only where the curve is steep or bends, within the 60 points of a uniform grid
+    defect_range, prob_origin = Sweep.refine(origin, -15, 15, initial = 15, tol = 3e-3, max_step = 0.2, max_points = 60)
 
     fig, ax = plt.subplots(figsize = (12, 10))
     ax.set_title("Probability at Origin vs Defect Strength", fontsize = 16)
@@ -43,22 +44,21 @@ def transmission_prob():
     momentum = 0.8
     spread = 10
     defect_distance = 15
-    times = np.linspace(0, t_max, t_max + 1, dtype = int)
 
     dir = Path("PlotAnalysis")
     path = dir / "Transmission.png"
 
-    defect_range = np.linspace(-15, 15, 60)
-    transmission_prob = []
-    for defect in tqdm(defect_range, desc = "Transmission Test"):
-        H_defected = Core.Hamiltonian(N)
-        H_defected.addDefects([center + defect_distance], [defect])
+    H = Core.Hamiltonian(N)
+    Psi = Core.Wavefunction(gaussian = True, Num_sites= N, center = center, spread= spread, momentum= momentum)
+    Evo = Core.Evolver(H, Psi)
 
-        Psi = Core.Wavefunction(gaussian = True, Num_sites= N, center = center, spread= spread, momentum= momentum)
-        Evo = Core.Evolver(H_defected, Psi)
+    def transmission(strengths):
+        site = center + defect_distance
+        _, prob = Evo.defectSweep(site, strengths, [t_max], sites = np.arange(site, N))
+        return prob[:, -1].sum(axis = 1)
 
-        _, prob = Evo.run(times)
-        transmission_prob.append(prob[-1][center + defect_distance:].sum())
+    defect_range, transmission_prob = Sweep.refine(transmission, -15, 15, initial = 9, tol = 3e-3, max_step = 0.2,
+                                                   max_points = 60)
 
     fig, ax = plt.subplots(figsize = (12, 10))
     ax.set_title("Transmission Probability vs Defect Strength", fontsize = 16)
@@ -76,30 +76,117 @@ def transmission_prob_momentum():
     defect_strength = 2.0
     spread = 10
     defect_distance = 15
-    times = np.linspace(0, t_max, t_max + 1, dtype = int)
 
     dir = Path("PlotAnalysis")
     path = dir / "Transmission_momentum.png"
 
-    momentum_range = np.linspace(0, np.pi/2, 20)
-    transmission_prob = []
-    for momentum in tqdm(momentum_range, desc = "Transmission Momentum Test"):
-        H_defected = Core.Hamiltonian(N)
-        H_defected.addDefects([center + defect_distance], [defect_strength])
+    H_defected = Core.Hamiltonian(N)
+    H_defected.addDefects([center + defect_distance], [defect_strength])
+    site = center + defect_distance
 
-        Psi = Core.Wavefunction(gaussian = True, Num_sites= N, center = center, spread= spread, momentum= momentum)
-        Evo = Core.Evolver(H_defected, Psi)
+    def transmission(momenta):
+        Psis = [Core.Wavefunction(gaussian = True, Num_sites= N, center = center, spread= spread, momentum= momentum)
+                for momentum in momenta]
+        Evo = Core.Evolver(H_defected, Psis)
 
-        _, prob = Evo.run(times)
-        transmission_prob.append(prob[-1][center + defect_distance:].sum())
+        # stops as soon as every packet has left the neighbourhood of the defect
+        _, prob, _ = Evo.finalState(t_max, region = (site - spread, site + spread), tol = 1e-6)
+        return prob[:, site:].sum(axis = 1)
+
+    # each refinement round is one batched evolution of the new momenta
+    momentum_range, transmission_prob = Sweep.refine(transmission, 0, np.pi/2, initial = 7, tol = 3e-3, max_step = 0.2,
+                                                     max_points = 20)
+
+    # exact plane-wave transmission from the transfer-matrix solver
+    k = np.linspace(1e-3, np.pi/2, 400)
+    transmission_exact, _ = Scattering.fromHamiltonian(H_defected, k)
 
     fig, ax = plt.subplots(figsize = (12, 10))
     ax.set_title("Transmission Probability vs Momentum of Wave Packet", fontsize = 16)
-    ax.plot(momentum_range, transmission_prob, label = "Probability at Origin")
+    ax.plot(momentum_range, transmission_prob, label = "Wave Packet")
+    ax.plot(k, transmission_exact, linestyle = "dashed", label = "Stationary T(k)")
     ax.set_xlabel("Momentum")
     ax.set_ylabel("Probability")
     ax.grid(True)
+    ax.legend()
+    plt.savefig(path, bbox_inches = "tight")
+
+def defect_sweep_check(tol: float = 1e-10):
+    # the secular defect sweep against re-diagonalizing every (site, strength), edge sites and a pre-defected base included
+    N = 201
+    t_max = 30
+    strengths = [-15, -3, -1, -0.3, -1e-3, 1e-3, 0.3, 1, 3, 15]
+    worst = 0.0
+    for base in ([], [120]):
+        H = Core.Hamiltonian(N)
+        H.addDefects(base, [2.0] * len(base))
+        Psi = Core.Wavefunction(gaussian = False, Num_sites = N, center = 100)
+        Evo = Core.Evolver(H, Psi)
+        energies, modes = H.eigensystem()
+        for site in [0, 1, 5, 25, 100, 150, N - 1]:
+            vectors, _ = Evo.defectSweep(site, strengths, [t_max], method = "secular")
+            for strength, vector in zip(strengths, vectors[:, -1]):
+                diag = H.diag.real.copy()
+                diag[site] += strength
+                exact_energies, exact_modes = la.eigh_tridiagonal(diag, H.bands[2, 1:].real)
+                mu = Core._rank_one_update(energies, modes[site], strength)[0]
+                exact = exact_modes @ (np.exp(-1j * exact_energies * t_max) * (exact_modes.T @ Psi.psi))
+                worst = max(worst, np.abs(np.sort(mu) - exact_energies).max(), np.abs(vector - exact).max())
+    if worst > tol:
+        raise ValueError(f"Defect sweep strays {worst:.2e} from re-diagonalizing")
+    return worst
+
+def trapping():
+    N = 1001
+    defect_sites = [400, 600]
+    defect_strength = [8.0, 8.0]
+    region = (400, 601)
+
+    center = 500
+    t_max = 5000
+    t_short = 250
+    times = np.linspace(0, t_max, t_max + 1, dtype = int)
+    dir = Path("PlotAnalysis")
+    dir.mkdir(parents = True, exist_ok = True)
+    path = dir / "Trapped.png"
+
+    H_defected = Core.Hamiltonian(N)
+    H_defected.addDefects(defect_sites, defect_strength)
+    Psi = Core.Wavefunction(gaussian = False, Num_sites = N, center = center)
+
+    # the evolution only covers the escape of the untrapped part, the long-time curve comes from the chain's eigenmodes;
+    # the chain is closed, so the escaped part returns and the time average counts its share of the region
+    Evo = Core.Evolver(H_defected, Psi)
+    _, prob = Evo.run(times[:t_short + 1])
+    trap = Trapping.trappedProbability(H_defected, Psi, region, times = times)
+
+    def trapped(strengths):
+        averages = []
+        for strength in strengths:
+            H = Core.Hamiltonian(N)
+            H.addDefects(defect_sites, [strength, strength])
+            averages.append(Trapping.trappedProbability(H, Psi, region)["average"])
+        return np.array(averages)
+
+    defect_range, trapped_average = Sweep.refine(trapped, 0.5, 15, initial = 15, max_points = 80)
+
+    fig, (ax_time, ax_strength) = plt.subplots(1, 2, figsize = (16, 8))
+    ax_time.set_title("Trapped Probability vs Time", fontsize = 16)
+    ax_time.plot(times[:t_short + 1], prob[:, region[0]:region[1]].sum(axis = 1), label = "Evolution")
+    ax_time.plot(times, trap["curve"], linestyle = "dashed", label = "Eigenmodes")
+    ax_time.axhline(trap["average"], color = "black", linestyle = "dotted", label = "Time Average")
+    ax_time.set_xlabel("Time")
+    ax_time.set_ylabel("Probability")
+    ax_time.grid(True)
+    ax_time.legend()
+    ax_strength.set_title("Time Averaged Trapped Probability vs Defect Strength", fontsize = 16)
+    ax_strength.plot(defect_range, trapped_average)
+    ax_strength.set_xlabel("Defect Strength")
+    ax_strength.set_ylabel("Probability")
+    ax_strength.grid(True)
     plt.savefig(path, bbox_inches = "tight")
+
 if __name__ == "__main__":
+    Cache.enable()
     transmission_prob_momentum()
 
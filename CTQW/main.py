@@ -1,6 +1,8 @@
 import numpy as np
+import Cache
 import Core
 import Plotting
+import Scenarios
 
 def localization():
     N = 501               # number of lattice sites
@@ -184,9 +186,7 @@ def trapping_gaussian():
 #     Plotting.MomentumDistAnimate(vec_vectors, times, "Resonance_Gaussian_Momentum")
 #
 if __name__ == "__main__":
-    localization()
-    reflection()
-    trapping()
-    reflection_gaussian()
-    trapping_gaussian()
+    Cache.enable()
+    # the scenarios above, declared in scenarios.json so shared Hamiltonians and evolutions are built once
+    Scenarios.run(Scenarios.load("scenarios.json"))
     # resonance_gaussian()
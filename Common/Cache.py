@@ -0,0 +1,204 @@
+import numpy as np
+import functools
+import hashlib
+import os
+import pickle
+import re
+import types
+from collections import OrderedDict
+
+# process-wide cache consulted by Evolver.run and Sweep.sweep, None until enable() is called
+default = None
+
+
+def enable(directory: str = ".cache", max_bytes: int = 2**30, memory_items: int = 16):
+    """
+    Turn on the process-wide result cache (e.g. at the top of a main script) and return it.
+    """
+    global default
+    default = ResultCache(directory, max_bytes, memory_items)
+    return default
+
+
+def disable():
+    global default
+    default = None
+
+
+def key(*parts) -> str:
+    """
+    Content hash of the parts: arrays by dtype, shape and bytes, everything else by repr.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(f"{part.dtype.str}{part.shape}".encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+def codeKey(function):
+    """
+    Content hash of what a function computes: its bytecode and constants (nested functions included), its
+    defaults, closure values and the module globals it refers to, recursing into referenced functions,
+    containers and the attributes of plain objects. Arrays count by dtype, shape and bytes.
+    Modules and classes count by name only, so edits to library code do not change the key.
+    Returns None when the function refers to a value without stable content (one that only reprs by its
+    address), whose results must then not be cached.
+    """
+    try:
+        return key(*_code_parts(function, {}))
+    except _Unstable:
+        return None
+
+
+class _Unstable(Exception):
+    pass
+
+
+_SCALARS = (type(None), bool, int, float, complex, str, bytes, np.generic)
+
+
+def _code_parts(value, seen: dict) -> list:
+    if isinstance(value, (_SCALARS, np.ndarray)):
+        return [value]
+    if isinstance(value, types.ModuleType):
+        return [value.__name__]
+    if isinstance(value, type):
+        return [f"{value.__module__}.{value.__qualname__}"]
+    if id(value) in seen:
+        return [f"<cycle {type(value).__qualname__}>"]
+    # keeps what it has seen alive, so the id of a temporary (a dict item, say) is never reused
+    seen[id(value)] = value
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        # set order follows string hashing, which differs between processes
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        parts = [f"{type(value).__qualname__}({len(items)})"]
+        for item in items:
+            parts += _code_parts(item, seen)
+        return parts
+    if isinstance(value, dict):
+        parts = [f"dict({len(value)})"]
+        for item in value.items():
+            parts += _code_parts(item, seen)
+        return parts
+    if isinstance(value, functools.partial):
+        return ["partial"] + _code_parts((value.func, value.args, value.keywords), seen)
+    if isinstance(value, types.MethodType):
+        return ["method"] + _code_parts((value.__func__, value.__self__), seen)
+    if isinstance(value, types.FunctionType):
+        parts = [f"{value.__module__}.{value.__qualname__}"]
+        parts += _code_parts((value.__defaults__, value.__kwdefaults__), seen)
+        for cell in value.__closure__ or ():
+            parts += _code_parts(cell.cell_contents, seen)
+        parts += _bytecode_parts(value.__code__, value.__globals__, seen)
+        return parts
+    if hasattr(value, "__dict__"):
+        return [f"{type(value).__module__}.{type(value).__qualname__}"] + _code_parts(vars(value), seen)
+    if re.search(r" at 0x[0-9a-fA-F]+", repr(value)):
+        raise _Unstable(type(value).__qualname__)
+    return [value]
+
+
+def _bytecode_parts(code, namespace: dict, seen: dict) -> list:
+    parts = [code.co_code]
+    for const in code.co_consts:
+        # nested code objects repr with their address, so hash their contents instead
+        parts += _bytecode_parts(const, namespace, seen) if isinstance(const, types.CodeType) else _code_parts(const, seen)
+    for name in code.co_names:
+        if name in namespace:
+            parts += [name] + _code_parts(namespace[name], seen)
+    return parts
+
+
+class ResultCache:
+    """
+    Content-addressed store of simulation results: one pickle per key on disk, evicted least recently
+    used first once the directory grows past max_bytes, with the last few entries also kept in memory.
+    Lookups hand out copies, so callers may modify what they get.
+    """
+    def __init__(self, directory: str = ".cache", max_bytes: int = 2**30, memory_items: int = 16):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key: str):
+        """
+        Stored value for key, or None.
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            value = self._memory[key]
+        else:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                self.misses += 1
+                return None
+            # the modification time doubles as the last-use stamp for eviction
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            self._remember(key, value)
+        self.hits += 1
+        return pickle.loads(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def put(self, key: str, value):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"     # concurrent writers of one key must not share the temporary
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self._remember(key, pickle.loads(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+        self._evict()
+
+    def _remember(self, key: str, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        # workers of other processes share the directory and may remove entries between listing and use
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            total -= size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            self._memory.pop(entry.name[:-len(".pkl")], None)
+
+    def clear(self):
+        self._memory.clear()
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".pkl"):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
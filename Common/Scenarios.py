@@ -0,0 +1,116 @@
+import numpy as np
+import json
+import tomllib
+from . import Cache
+from concurrent.futures import ProcessPoolExecutor
+
+
+def load(path: str):
+    """
+    Scenario list from a JSON or TOML file (by extension) with a top-level "scenario" array; each walk's
+    Scenarios.load documents the entries it understands.
+    """
+    with open(path, "rb") as f:
+        spec = tomllib.load(f) if str(path).endswith(".toml") else json.load(f)
+    return spec["scenario"]
+
+
+def _key(*parts):
+    # canonical text of a node spec, equal specs share one node
+    return json.dumps(parts, sort_keys=True)
+
+
+def _times(spec: dict):
+    t_max = spec["t_max"]
+    return np.linspace(0, t_max, spec.get("num", int(t_max) + 1), dtype=int)
+
+
+def _defects(spec: dict, values: str):
+    """
+    Canonical defects spec: sites and their `values` as per-site lists of int and float (a scalar value applies
+    to every site), both dropped when there are no sites, so equal Hamiltonians get equal keys.
+    """
+    spec = dict(spec)
+    sites = np.atleast_1d(np.asarray(spec.pop("sites", []), dtype=int))
+    strengths = spec.pop(values, [])
+    if sites.size:
+        spec["sites"] = sites.tolist()
+        spec[values] = np.broadcast_to(np.asarray(strengths, dtype=float), sites.shape).tolist()
+    return spec
+
+
+def plan(scenarios, values: str):
+    """
+    Dependency graph of the batch: unique Hamiltonian, initial-state and evolution nodes keyed by their
+    canonical spec (see _defects, `values` names the per-site defect entry), plus the evolution keys each
+    scenario consumes, in walk order.
+    """
+    graph = {"hamiltonian": {}, "state": {}, "evolution": {}, "scenarios": []}
+    for scenario in scenarios:
+        N = scenario["N"]
+        needs = []
+        for walk in scenario["walks"]:
+            defects = _defects(walk.get("defects", {}), values)
+            h_key = _key(N, defects)
+            s_key = _key(N, walk["state"])
+            e_key = _key(h_key, s_key, scenario["times"])
+            graph["hamiltonian"][h_key] = (N, defects)
+            graph["state"][s_key] = (N, walk["state"])
+            graph["evolution"][e_key] = (h_key, s_key, scenario["times"])
+            needs.append(e_key)
+        graph["scenarios"].append((scenario, needs))
+    return graph
+
+
+def _enable_cache(directory, max_bytes, memory_items):
+    Cache.enable(directory, max_bytes, memory_items)
+
+
+def _evolve(task):
+    evolver, H, Psi, times = task
+    return evolver(H, Psi).run(times)
+
+
+def run(scenarios, values: str, evolver, build_hamiltonian, build_state, stage_table: dict,
+        workers: int = None, stages: bool = True):
+    """
+    Build every unique Hamiltonian and initial state once with build_hamiltonian(N, defects), defects in the
+    canonical form of plan(scenarios, values), and build_state(N, state), evolve every unique (Hamiltonian,
+    state, times) node once with the walk's evolver class over a process pool (workers=0 runs them here),
+    then hand each scenario its results and run its stages from stage_table, kind -> f(name, times, vectors,
+    probabilities, **options) with one entry of each list per walk.
+    Returns {name: {"times", "vectors", "probability"}} with one entry per walk in the last two.
+    """
+    graph = plan(scenarios, values)
+    for scenario, _ in graph["scenarios"]:
+        for stage in scenario.get("stages", []):
+            if stage["kind"] not in stage_table:
+                raise ValueError(f"Unknown stage {stage['kind']!r}")
+
+    hamiltonians = {key: build_hamiltonian(*spec) for key, spec in graph["hamiltonian"].items()}
+    states = {key: build_state(*spec) for key, spec in graph["state"].items()}
+
+    keys = list(graph["evolution"])
+    tasks = [(evolver, hamiltonians[h], states[s], _times(t)) for h, s, t in graph["evolution"].values()]
+    if workers == 0:
+        outputs = list(map(_evolve, tasks))
+    else:
+        # workers share the on-disk cache of this process, if there is one
+        cache = Cache.default
+        initargs = (cache.directory, cache.max_bytes, cache.memory_items) if cache is not None else None
+        with ProcessPoolExecutor(max_workers=workers, initializer=_enable_cache if cache else None,
+                                 initargs=initargs or ()) as pool:
+            outputs = list(pool.map(_evolve, tasks))
+    evolutions = dict(zip(keys, outputs))
+
+    results = {}
+    for scenario, needs in graph["scenarios"]:
+        times = _times(scenario["times"])
+        vectors = [evolutions[key][0] for key in needs]
+        probs = [evolutions[key][1] for key in needs]
+        results[scenario["name"]] = {"times": times, "vectors": vectors, "probability": probs}
+        if stages:
+            for stage in scenario.get("stages", []):
+                options = {k: v for k, v in stage.items() if k != "kind"}
+                stage_table[stage["kind"]](scenario["name"], times, vectors, probs, **options)
+    return results
@@ -0,0 +1,186 @@
+import numpy as np
+import copy
+import itertools
+import os
+import time
+from . import Cache
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# worker-side state set up once by _attach
+_BASE = {}
+
+
+def gridPoints(grid):
+    """
+    Points of a parameter grid in C order: a dict {name: values} becomes the list of dicts of its
+    cartesian product, any other sequence is taken as the list of points itself.
+    """
+    if isinstance(grid, dict):
+        names = list(grid)
+        return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    return list(grid)
+
+
+def _share(obj, names, segments):
+    """
+    Copy the named arrays of obj into new shared-memory segments.
+    Returns (skeleton, specs): a shallow copy of obj without those arrays and {name: (segment, shape, dtype)}.
+    """
+    skeleton = copy.copy(obj)
+    specs = {}
+    for name in names:
+        if getattr(obj, name) is None:
+            continue
+        array = np.ascontiguousarray(getattr(obj, name))
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+        segments.append(segment)
+        specs[name] = (segment.name, array.shape, array.dtype.str)
+        setattr(skeleton, name, None)
+    return skeleton, specs
+
+
+def _attach(H, H_specs, Psi, Psi_specs, evaluate):
+    """
+    Pool initializer: map the shared segments read-only into the skeletons once per worker.
+    """
+    segments = []
+    for obj, specs in ((H, H_specs), (Psi, Psi_specs)):
+        for name, (segment_name, shape, dtype) in specs.items():
+            segment = shared_memory.SharedMemory(name=segment_name)
+            array = np.ndarray(shape, dtype, buffer=segment.buf)
+            array.flags.writeable = False
+            setattr(obj, name, array)
+            segments.append(segment)
+    _BASE.update(H=H, Psi=Psi, evaluate=evaluate, segments=segments)
+
+
+def _evaluate(task):
+    index, point = task
+    start = time.perf_counter()
+    result = _BASE["evaluate"](_BASE["H"].copy(), _BASE["Psi"], point)
+    return index, result, os.getpid(), time.perf_counter() - start
+
+
+def sweep(evaluate, grid, Hamiltonian, Wavefunction, shared: dict, skeleton, tag: str, workers: int = None,
+          chunksize: int = 1):
+    """
+    Evaluate every point of a parameter grid over a process pool.
+    evaluate(H, Psi, point) -> result must be a module-level function; H is a private copy of the base
+    Hamiltonian (free to add defects to) and Psi the shared initial state, whose psi must not be written.
+    The walk supplies shared = {"Hamiltonian": names, "Wavefunction": names}, the array attributes placed in
+    shared memory once instead of being pickled per task, skeleton(H) clearing what the workers rebuild from
+    them, and the tag its cache keys start with.
+    workers=0 evaluates in this process.
+    Once Cache.enable() was called, points already evaluated (same evaluate code and the values it refers to,
+    base walk and initial state) are read back and only the new ones are sent to the pool; an evaluate
+    referring to values without stable content (see Cache.codeKey) is not cached.
+    Returns (results, timing): results in grid order and {pid: {"points": n, "seconds": s}} per worker
+    (cached points are not timed).
+    """
+    points = gridPoints(grid)
+    results = [None] * len(points)
+    todo = list(range(len(points)))
+
+    cache = Cache.default
+    code = Cache.codeKey(evaluate) if cache is not None else None
+    if code is not None:
+        keys = [Cache.key(tag, code, Hamiltonian.fingerprint(), Wavefunction.psi, point) for point in points]
+        results = [cache.get(k) for k in keys]
+        todo = [i for i, result in enumerate(results) if result is None]
+    if not todo:
+        return results, {}
+
+    segments = []
+    try:
+        H, H_specs = _share(Hamiltonian, shared["Hamiltonian"], segments)
+        Psi, Psi_specs = _share(Wavefunction, shared["Wavefunction"], segments)
+        initargs = (skeleton(H), H_specs, Psi, Psi_specs, evaluate)
+
+        if workers == 0:
+            _attach(*initargs)
+            outputs = list(map(_evaluate, [(i, points[i]) for i in todo]))
+            _BASE.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=initargs) as pool:
+                outputs = list(pool.map(_evaluate, [(i, points[i]) for i in todo], chunksize=chunksize))
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    timing = {}
+    for index, result, pid, seconds in outputs:
+        results[index] = result
+        if code is not None:
+            cache.put(keys[index], result)
+        worker = timing.setdefault(pid, {"points": 0, "seconds": 0.0})
+        worker["points"] += 1
+        worker["seconds"] += seconds
+    return results, timing
+
+
+def _interval_errors(x, y, span, scale):
+    """
+    Refinement indicator of every interval [x_i, x_{i+1}]: the larger of its normalized arc length
+    (steep stretches) and the midpoint error of linear interpolation against the parabolas through the
+    neighbouring triples (curvature). y may carry trailing axes for several curves, the worst one counts.
+    """
+    h = np.diff(x)
+    dy = np.diff(y, axis=0) / scale
+    step = np.sqrt((h / span)**2 + (np.abs(dy).reshape(len(h), -1).max(axis=1))**2)
+
+    # second divided differences at the interior points, curvature error ~ |y''| h^2 / 8
+    curvature = np.zeros(len(h))
+    if len(x) > 2:
+        slopes = dy / h.reshape((-1,) + (1,) * (dy.ndim - 1))
+        d2 = np.abs(np.diff(slopes, axis=0)).reshape(len(h) - 1, -1).max(axis=1) / (0.5 * (h[1:] + h[:-1]))
+        curvature[:-1] = np.maximum(curvature[:-1], d2 * h[:-1]**2 / 8)
+        curvature[1:] = np.maximum(curvature[1:], d2 * h[1:]**2 / 8)
+    return step, curvature
+
+
+def refine(evaluate, lo: float, hi: float, initial: int = 9, tol: float = 1e-3, max_step: float = 0.05,
+           min_width: float = None, max_points: int = 200, known=None):
+    """
+    Adaptive 1-D sweep: evaluate on a coarse grid of `initial` points, then keep bisecting the intervals
+    whose curvature error exceeds tol or whose normalized arc length exceeds max_step (both measured with
+    x scaled by hi - lo and y by its range), until none is left, they are narrower than min_width or
+    max_points is reached.
+    evaluate(xs) -> values of shape (len(xs), ...) is called once per round with all new points, so it can be a
+    batched evolution or a sweep() over a pool. known = (x, y) from an earlier call is reused, not re-evaluated.
+    Returns (x, y) sorted by x.
+    """
+    span = hi - lo
+    if min_width is None:
+        min_width = span * 1e-6
+
+    x = np.empty(0)
+    y = None
+    if known is not None:
+        x, y = np.asarray(known[0], dtype=float), np.asarray(known[1])
+
+    new = np.linspace(lo, hi, initial)
+    while True:
+        new = new[~np.isin(new, x)]
+        if new.size:
+            values = np.asarray(evaluate(new))
+            x = np.concatenate([x, new])
+            y = values if y is None else np.concatenate([y, values])
+            order = np.argsort(x)
+            x, y = x[order], y[order]
+
+        inside = (x >= lo) & (x <= hi)
+        xs, ys = x[inside], y[inside]
+        scale = np.ptp(ys) or 1.0
+        step, curvature = _interval_errors(xs, ys, span, scale)
+        error = np.maximum(step / max_step, curvature / tol)
+        candidates = np.flatnonzero((error > 1.0) & (np.diff(xs) > 2 * min_width))
+
+        budget = max_points - len(xs)
+        if candidates.size == 0 or budget <= 0:
+            return x, y
+        # worst intervals first when the budget does not cover all of them
+        candidates = candidates[np.argsort(error[candidates])[::-1][:budget]]
+        new = 0.5 * (xs[candidates] + xs[candidates + 1])
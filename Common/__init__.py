@@ -0,0 +1 @@
+"""Modules shared by the CTQW and DTQW walks, imported through their Cache, Sweep and Scenarios."""
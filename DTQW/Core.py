@@ -1,68 +1,262 @@
 import numpy as np
 import scipy.sparse as sp
+import scipy.linalg as la
+import hashlib
+import os
+import warnings
+import Cache
 from typing import Sequence
 
+# precision name -> complex dtype of amplitudes and coins
+PRECISIONS = {"double": np.complex128, "single": np.complex64}
+
+# fast-forward works on dense 2W x 2W matrices of the causal window W: at most this dimension, and only when
+# the ~ (2W)^3 decomposition beats stepping, ~ W per step, i.e. (2W)^2 <= JUMP_RATIO * steps
+JUMP_DIM = 4096
+JUMP_RATIO = 1.5
+
+
+def _dtype(precision: str):
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}")
+    return PRECISIONS[precision]
+
+
 class Hamiltonian:
     """
     For DTQW we store the one-step unitary U (2N x 2N sparse matrix)
     in self.Hamiltonian (to match your CTQW naming).
     The basis ordering: index = 2*pos + coin (coin=0,1).
     """
-    def __init__(self, Num_sites: int):
+    def __init__(self, Num_sites: int, precision: str = "double"):
         self.N = Num_sites
+        # precision of the assembled U; coin parameters are always kept in double
+        self.precision = precision
+        self.dtype = _dtype(precision)
         # build Hadamard coin blocks (will be used as default coin at each site)
         self._hadamard = (1 / np.sqrt(2)) * np.array([[1, 1], [1, -1]], dtype=complex)
-        # default no-defect unitary
-        self.Hamiltonian = self._build_unitary(defect_sites={}, as_sparse=True)
+        self.defects: dict[int, float] = {}
+        # per-site coin parameters: coin_j = sqrt(1 - absorber_j) * e^{i phases_j} * base_j,
+        # base_j is the Hadamard unless setCoins() gave arbitrary (N, 2, 2) blocks
+        self.base = None
+        self.phases = np.zeros(self.N)
+        # fraction of the probability lost per step at each site (lossy edge coins), 0 = unitary
+        self.absorber = np.zeros(self.N)
+        # caches for fast-forwarding, dropped whenever a coin changes
+        self._version = 0
+        self._eigs = None
+        self._powers = (-1, [])
+        # the unitary is only assembled when first asked for, the matrix-free evolver never needs it
+        self._U = None
+
+    @property
+    def Hamiltonian(self):
+        if self._U is None:
+            self._U = self._build_unitary()
+        return self._U
+
+    def coins(self, sites: np.ndarray = None):
+        """
+        Coin blocks (n, 2, 2) at the given sites (all sites if None).
+        """
+        if sites is None:
+            sites = np.arange(self.N)
+        factor = np.sqrt(1.0 - self.absorber[sites]) * np.exp(1j * self.phases[sites])
+        base = self._hadamard if self.base is None else self.base[sites]
+        return factor[:, None, None] * base
+
+    def gains(self, sites: np.ndarray = None):
+        """
+        Scalar g_j with coin_j = g_j * [[1, 1], [1, -1]], i.e. sqrt(1 - absorber_j) * e^{i phases_j} / sqrt(2).
+        Only defined while every coin is a Hadamard up to a factor.
+        """
+        if self.base is not None:
+            raise ValueError("Arbitrary coins have no scalar gain, use coins()")
+        if sites is None:
+            sites = np.arange(self.N)
+        return np.sqrt(0.5 * (1.0 - self.absorber[sites])) * np.exp(1j * self.phases[sites])
+
+    def setCoins(self, coins: np.ndarray):
+        """
+        Replace the Hadamard by arbitrary per-site 2x2 coins (N, 2, 2), e.g. random SU(2) disorder.
+        Phase defects and absorbers still multiply on top of them.
+        """
+        coins = np.asarray(coins, dtype=complex)
+        if coins.shape != (self.N, 2, 2):
+            raise ValueError("Coins must have shape (N, 2, 2)")
+        self.base = coins
+        self._patch(np.arange(self.N))
+
+    def copy(self):
+        """
+        Independent walk with its own coin parameters; the eigensystem is shared until either side changes a coin,
+        U and its powers are rebuilt lazily.
+        """
+        H = Hamiltonian.__new__(Hamiltonian)
+        H.N = self.N
+        H.precision = self.precision
+        H.dtype = self.dtype
+        H._hadamard = self._hadamard
+        H.defects = dict(self.defects)
+        H.base = None if self.base is None else self.base.copy()
+        H.phases = self.phases.copy()
+        H.absorber = self.absorber.copy()
+        H._version = self._version
+        H._eigs = self._eigs
+        H._powers = (-1, [])
+        H._U = None
+        return H
 
-    def _build_unitary(self, defect_sites: dict[int, float], as_sparse: bool = True):
+    def fingerprint(self) -> str:
+        """
+        Short hash of the coins (size, phases, absorber, arbitrary blocks), used to match checkpoints to this walk.
         """
-        Construct U = S * C_total where C_total is block-diagonal coin operator.
-        defect_sites: mapping pos -> phase (radians). At those sites coin = e^{i phi} * H
+        digest = hashlib.sha256(np.int64(self.N).tobytes())
+        for array in (self.phases, self.absorber, self.base):
+            if array is not None:
+                digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()[:16]
+
+    def _build_unitary(self):
+        """
+        Construct U = S * C directly in CSR form with vectorized index arrays.
+        coin=0 => move right (pos -> pos+1); coin=1 => move left (pos -> pos-1), so
+        row 2q+0 holds the first coin row of site q-1 and row 2q+1 the second coin row of site q+1.
+        The data offsets of every site are kept so defects can later patch U in place.
         """
         N = self.N
-        # build block-diagonal coin operator (2N x 2N)
-        blocks = []
-        for pos in range(N):
-            phi = defect_sites.get(pos, 0.0)
-            if abs(phi) < 1e-15:
-                Cj = self._hadamard
-            else:
-                Cj = np.exp(1j * phi) * self._hadamard
-            blocks.append(sp.csr_matrix(Cj))
-        C_total = sp.block_diag(blocks, format='csr')  # 2N x 2N
-
-        # conditional shift S
         N2 = 2 * N
-        rows = []
-        cols = []
-        data = []
-
-        def idx(p, c): return 2 * p + c
-
-        # coin=0 => move right (pos -> pos+1); coin=1 => move left (pos -> pos-1)
-        for p in range(N):
-            rpos = p + 1
-            lpos = p - 1
-            # shift right for coin 0
-            if 0 <= rpos < N:
-                rows.append(idx(rpos, 0)); cols.append(idx(p, 0)); data.append(1.0)
-            # shift left for coin 1
-            if 0 <= lpos < N:
-                rows.append(idx(lpos, 1)); cols.append(idx(p, 1)); data.append(1.0)
-
-        S = sp.csr_matrix((data, (rows, cols)), shape=(N2, N2))
-        U = S.dot(C_total)  # 2N x 2N sparse matrix
-        return U if as_sparse else U.toarray()
-
-    def addDefects(self, def_sites: list[int], defect_str: float):
-        """
-        Add phase-defects by rebuilding U with phases at given positions.
+        pos = np.arange(N)
+
+        # two entries per row, except the first (nothing moves right into site 0)
+        # and the last (nothing moves left into site N-1)
+        counts = np.full(N2, 2)
+        counts[0] = 0
+        counts[-1] = 0
+        indptr = np.zeros(N2 + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        # where the two coin rows of each site live in U.data (-1: the walker leaves the lattice)
+        self._row0_ptr = np.full(N, -1, dtype=np.int64)
+        self._row1_ptr = np.full(N, -1, dtype=np.int64)
+        self._row0_ptr[:-1] = indptr[2 * (pos[:-1] + 1)]
+        self._row1_ptr[1:] = indptr[2 * (pos[1:] - 1) + 1]
+
+        indices = np.empty(indptr[-1], dtype=np.int64)
+        data = np.empty(indptr[-1], dtype=self.dtype)
+        for ptr in (self._row0_ptr, self._row1_ptr):
+            valid = ptr >= 0
+            indices[ptr[valid]] = 2 * pos[valid]
+            indices[ptr[valid] + 1] = 2 * pos[valid] + 1
+
+        U = sp.csr_matrix((data, indices, indptr), shape=(N2, N2))
+        self._write_coins(U, pos)
+        return U
+
+    def _write_coins(self, U, sites: np.ndarray):
+        # overwrite the coin blocks of the given sites inside U.data, nothing else is touched
+        coins = self.coins(sites)
+        for row, ptr in enumerate((self._row0_ptr[sites], self._row1_ptr[sites])):
+            valid = ptr >= 0
+            U.data[ptr[valid]] = coins[valid, row, 0]
+            U.data[ptr[valid] + 1] = coins[valid, row, 1]
+
+    def _patch(self, sites: np.ndarray):
+        self._version += 1
+        if self._U is not None:
+            self._write_coins(self._U, sites)
+
+    def window(self, lo: int, hi: int):
+        """
+        U restricted to the sites lo..hi-1, exact for walks that do not reach the window's edges.
+        """
+        return self.Hamiltonian[2 * lo:2 * hi, 2 * lo:2 * hi]
+
+    def eigensystem(self, max_error: float = 1e-8, window: tuple = None):
+        """
+        Quasi-energy decomposition U = V diag(lam) V^-1, lam = |lam| e^{-i E}, of the whole walk or of
+        window = (lo, hi), cached until a coin changes.
+        Returns (lam, V, V_inv). Raises LinAlgError if V is too ill-conditioned to be trusted
+        (the open walls make U non-normal).
+        """
+        lo, hi = (0, self.N) if window is None else window
+        key = (self._version, lo, hi)
+        if self._eigs is None or self._eigs[0] != key:
+            lam, V = la.eig(self.window(lo, hi).toarray())
+            V_inv = la.inv(V)
+            if np.abs(V_inv @ V - np.eye(V.shape[0])).max() > max_error:
+                raise np.linalg.LinAlgError("Eigenvectors of U are too ill-conditioned for fast-forwarding")
+            self._eigs = (key, lam, V, V_inv)
+        return self._eigs[1:]
+
+    def applyPower(self, steps: int, psi: np.ndarray, window: tuple = None):
+        """
+        U^steps @ psi by repeated squaring, on the whole walk or on window = (lo, hi) with psi covering
+        only its sites; the squares U^(2^k) are cached until a coin changes.
+        psi: (2N,) or (2N, B), 2 (hi - lo) rows with a window
+        """
+        lo, hi = (0, self.N) if window is None else window
+        key = (self._version, lo, hi)
+        if self._powers[0] != key:
+            self._powers = (key, [self.window(lo, hi)])
+        powers = self._powers[1]
+
+        k = 0
+        while steps:
+            if k == len(powers):
+                square = powers[-1] @ powers[-1]
+                # fill-in grows with the power, switch to dense once that is cheaper
+                if sp.issparse(square) and square.nnz > 0.25 * square.shape[0] * square.shape[1]:
+                    square = square.toarray()
+                powers.append(square)
+            if steps & 1:
+                psi = powers[k] @ psi
+            steps >>= 1
+            k += 1
+        return psi
+
+    def addDefects(self, def_sites: list[int], defect_str):
+        """
+        Set phase-defects at the given positions by patching their coin blocks in U.
         def_sites : list of positions (int)
-        defect_str: phase in radians (float). This multiplies the Hadamard at the site by e^{i*defect_str}.
+        defect_str: phase in radians (float, or one per site). This multiplies the Hadamard at the site by e^{i*defect_str}.
         """
-        defect_map = {int(s): float(defect_str) for s in def_sites}
-        self.Hamiltonian = self._build_unitary(defect_sites=defect_map, as_sparse=True)
+        sites = np.asarray(def_sites, dtype=int)
+        strengths = np.broadcast_to(np.asarray(defect_str, dtype=float), sites.shape)
+        self.phases[sites] = strengths
+        self.defects.update(zip(sites.tolist(), strengths.tolist()))
+        self._patch(sites)
+
+    def removeDefects(self, def_sites: list[int]):
+        """
+        Restore the plain Hadamard coin at the given positions.
+        """
+        sites = np.asarray(def_sites, dtype=int)
+        self.phases[sites] = 0.0
+        for s in sites.tolist():
+            self.defects.pop(s, None)
+        self._patch(sites)
+
+    def addAbsorber(self, width: int, strength: float = 0.5):
+        """
+        Lossy coins on the outer `width` sites at both edges. The loss per step rises quadratically
+        to `strength` (0 < strength <= 1) at the walls, so packets leave instead of reflecting.
+        Norm lost there is reported by outflux().
+        """
+        profile = strength * ((width - np.arange(width)) / width)**2
+        self.absorber[:width] = profile
+        self.absorber[self.N - width:] = profile[::-1]
+        edges = np.r_[np.arange(width), np.arange(self.N - width, self.N)]
+        self._patch(edges)
+
+    def outflux(self, prob: np.ndarray):
+        """
+        Probability absorbed at the (left, right) edges during the next step, shape (..., 2).
+        prob: position probabilities (..., N)
+        """
+        loss = self.absorber * prob
+        half = self.N // 2
+        return np.stack([loss[..., :half].sum(axis=-1), loss[..., half:].sum(axis=-1)], axis=-1)
 
 
 class Wavefunction:
@@ -71,7 +265,8 @@ class Wavefunction:
     If gaussian==False: it creates a localized state at 'center' with equal coin amplitudes.
     If gaussian==True: creates a Gaussian position envelope times e^{i k j}, with coin chosen as right-moving default.
     """
-    def __init__(self, gaussian: bool, Num_sites: int, center: int, coin_init: np.ndarray = np.array([1.0, 0.0 + 1.0j], dtype=complex) / np.sqrt(2)):
+    def __init__(self, gaussian: bool, Num_sites: int, center: int, coin_init: np.ndarray = np.array([1.0, 0.0 + 1.0j], dtype=complex) / np.sqrt(2),
+                 precision: str = "double"):
         self.N = Num_sites
         self.sites = np.arange(self.N)
         # localized at center, equal superposition in coin (normalized)
@@ -80,63 +275,462 @@ class Wavefunction:
         psi[2*center + 0] = coin_state[0]
         psi[2*center + 1] = coin_state[1]
         psi /= np.linalg.norm(psi)
-        self.psi = psi
+        self.psi = psi.astype(_dtype(precision))
+
+
+_BLOCK = 8192   # sites per slab in _step, keeps the working set of one step in cache
+
+
+def _step(state: np.ndarray, out: np.ndarray, gains: np.ndarray):
+    """
+    One coin + shift step from state into out, both (n, 2) amplitude arrays, without allocating.
+    The coin at site j is gains[j] * [[1, 1], [1, -1]]: coin 0 (a0 + a1) moves right and
+    coin 1 (a0 - a1) moves left; amplitude leaving the ends is dropped as with U.
+    """
+    n = state.shape[-2]
+    for i in range(0, n - 1, _BLOCK):
+        j = min(i + _BLOCK, n - 1)
+        right = out[..., i + 1:j + 1, 0]
+        np.add(state[..., i:j, 0], state[..., i:j, 1], out=right)
+        right *= gains[..., i:j]
+        left = out[..., i:j, 1]
+        np.subtract(state[..., i + 1:j + 1, 0], state[..., i + 1:j + 1, 1], out=left)
+        left *= gains[..., i + 1:j + 1]
+    out[..., 0, 0] = 0.0
+    out[..., -1, 1] = 0.0
+
+
+def _step_general(state: np.ndarray, out: np.ndarray, coins: np.ndarray):
+    """
+    Same as _step for arbitrary (n, 2, 2) coin blocks, e.g. random SU(2) disorder.
+    """
+    right = out[..., 1:, 0]
+    np.multiply(coins[..., :-1, 0, 0], state[..., :-1, 0], out=right)
+    right += coins[..., :-1, 0, 1] * state[..., :-1, 1]
+    left = out[..., :-1, 1]
+    np.multiply(coins[..., 1:, 1, 0], state[..., 1:, 0], out=left)
+    left += coins[..., 1:, 1, 1] * state[..., 1:, 1]
+    out[..., 0, 0] = 0.0
+    out[..., -1, 1] = 0.0
 
 
 class Evolver:
     """
-    Evolver accepts the Hamiltonian (unitary) and Wavefunction and evolves by repeated application of U.
+    Evolver accepts the Hamiltonian (unitary) and Wavefunction and evolves with a matrix-free
+    coin + shift step on (N, 2) amplitude arrays (equivalent to applying U).
     Its run(times) returns (vectors, probability) where:
       - vectors.shape == (nt, 2N) (complex states at requested times)
       - probability.shape == (nt, N) (position probabilities summed over coin)
+    Lists of Hamiltonians and/or Wavefunctions are evolved together as one (B, N, 2) batch
+    (a single object is shared by the whole batch); results then get a leading B axis.
     """
-    def __init__(self, Hamiltonian, Wavefunction):
+    def __init__(self, Hamiltonian, Wavefunction, adaptive: bool = False, threshold: float = 1e-12, margin: int = 32,
+                 fastforward: bool = False, lightcone: bool = False,
+                 precision: str = None, check_every: int = 0, drift_tol: float = 1e-4,
+                 checkpoint: str = None, checkpoint_every: int = 50):
         self.Hamiltonian = Hamiltonian
         self.Wavefunction = Wavefunction
 
-        self.U = getattr(Hamiltonian, "Hamiltonian")  # sparse 2N x 2N
-        self.psi0 = getattr(Wavefunction, "psi")      # length 2N
+        # fast-forward jumps straight to each requested step with the cached eigen-decomposition of U on the causal
+        # window (or repeated squaring when that is ill-conditioned) instead of stepping through all of them;
+        # windows too large for that to pay off are stepped as usual
+        self.fastforward = fastforward
+
+        # light-cone mode only steps the causal window of the initial support, which grows one site per side per step
+        self.lightcone = lightcone
+
+        # adaptive mode only steps the sites with |psi| > threshold, widened by the light cone of each chunk
+        self.adaptive = adaptive
+        self.threshold = threshold
+        self.margin = margin   # max steps taken on one window before its support is re-measured
+
+        hams = Hamiltonian if isinstance(Hamiltonian, (list, tuple)) else None
+        wfs = Wavefunction if isinstance(Wavefunction, (list, tuple)) else None
+        self.batched = hams is not None or wfs is not None
+        if hams is not None and wfs is not None and len(hams) != len(wfs):
+            raise ValueError("Batch of Hamiltonians and Wavefunctions must have the same length")
+
+        first_H = hams[0] if hams is not None else Hamiltonian
+        first_wf = wfs[0] if wfs is not None else Wavefunction
+        self.N = first_wf.N
+
+        self._first_H = first_H
+        if wfs is not None:
+            self.psi0 = np.stack([getattr(wf, "psi") for wf in wfs])   # (B, 2N)
+        else:
+            self.psi0 = getattr(Wavefunction, "psi")      # length 2N
+
+        # "single" steps complex64 amplitudes (None follows the initial state); fast-forward always works in double.
+        # Every check_every-th snapshot of a single-precision stream is recomputed in double from the previous one
+        # and the discrepancy is logged in self.drift as (t, accumulated norm drift, relative step error)
+        if precision is None:
+            precision = "single" if self.psi0.dtype == np.complex64 else "double"
+        self.precision = precision
+        self.dtype = _dtype(precision)
+        self.psi0 = self.psi0.astype(self.dtype, copy=False)
+        self.check_every = check_every
+        self.drift_tol = drift_tol
+        self.drift = []
+
+        # the stepping stream saves its state to the directory `checkpoint` every checkpoint_every snapshots
+        # and at the end, one compressed npz per (coins, initial state, precision); stream/run(resume=True)
+        # pick it up again. Fast-forward and light-cone runs are not checkpointed.
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.resumed_from = None
 
         # quick checks
-        if self.U.shape[0] != 2 * self.Wavefunction.N:
+        if first_H.N != self.N:
             raise ValueError("Unitary dimension mismatch vs wavefunction length")
 
-    def run(self, times: np.ndarray):
+    @property
+    def monitored(self) -> bool:
+        return self.precision == "single" and self.check_every > 0
+
+    @property
+    def U(self):
+        return getattr(self._first_H, "Hamiltonian")  # sparse 2N x 2N
+
+    def _hamiltonians(self):
+        return self.Hamiltonian if isinstance(self.Hamiltonian, (list, tuple)) else [self.Hamiltonian]
+
+    def _coin_params(self, sites: np.ndarray = None):
+        """
+        Per-site coin data for the stepper: the gains (n,) when every coin is a Hadamard up to a factor,
+        otherwise the full blocks (n, 2, 2); with a leading B axis for a batch of Hamiltonians.
+        """
+        self._general = any(H.base is not None for H in self._hamiltonians())
+        if self._general:
+            params = [H.coins(sites) for H in self._hamiltonians()]
+        else:
+            params = [H.gains(sites) for H in self._hamiltonians()]
+        return np.stack(params) if isinstance(self.Hamiltonian, (list, tuple)) else params[0]
+
+    def _advance(self, state: np.ndarray, out: np.ndarray, params: np.ndarray):
+        if self._general:
+            _step_general(state, out, params)
+        else:
+            _step(state, out, params)
+
+    def _sites(self, params: np.ndarray, lo: int, hi: int):
+        # coin data of sites lo..hi-1
+        return params[..., lo:hi, :, :] if self._general else params[..., lo:hi]
+
+    def run(self, times: np.ndarray, resume: bool = False):
         """
         times: 1D integer-like sequence (e.g., np.arange(0, tmax+1))
         Returns: (vectors, probability)
+        With resume=True the run restarts from the latest compatible checkpoint and only the steps
+        at or after it (from self.resumed_from on) are returned.
+        Once Cache.enable() was called, finished runs are stored and identical ones are read back instead.
         """
         times = np.asarray(times, dtype=int)
         if times.ndim != 1 or times.size == 0:
             raise ValueError("Boy that times better be an array")
 
+        cache = None if resume else Cache.default
+        if cache is not None:
+            batch = self._batch_size() if self.batched else None
+            cache_key = Cache.key("dtqw", self._fingerprints(), self.psi0, batch, times, self.precision,
+                                  self.adaptive, self.threshold, self.margin)
+            vecs = cache.get(cache_key)
+            if vecs is not None:
+                return vecs, (np.abs(vecs.reshape(vecs.shape[:-1] + (self.N, 2)))**2).sum(axis=-1)
+
+        if resume:
+            saved = self._load_checkpoint()
+            if saved is not None and saved[0] <= times[-1]:
+                times = times[times >= saved[0]]
+
         nt = times.size
-        tmax = int(times[-1])
-
-        N2 = 2 * self.Wavefunction.N
-        # iterate step-by-step and capture requested samples (fast enough for moderate tmax).
-        vecs = np.zeros((nt, N2), dtype=complex)
-        prob = np.zeros((nt, self.Wavefunction.N), dtype=float)
-
-        psi = self.psi0.copy()
-        # if time 0 requested, store it
-        sample_index = 0
-        t_requested = set(int(t) for t in times)
-
-        if 0 in t_requested:
-            vecs[sample_index, :] = psi
-            # compute position probabilities (sum over coin)
-            probs_pos = (np.abs(psi.reshape(-1, 2))**2).sum(axis=1)
-            prob[sample_index, :] = probs_pos
-            sample_index += 1
-
-        # apply unitary for steps 1..tmax
-        for t in range(1, tmax + 1):
-            psi = self.U.dot(psi)
-            if t in t_requested:
-                vecs[sample_index, :] = psi
-                probs_pos = (np.abs(psi.reshape(-1, 2))**2).sum(axis=1)
-                prob[sample_index, :] = probs_pos
-                sample_index += 1
+        N2 = 2 * self.N
+        batch = (self._batch_size(),) if self.batched else ()
+        vecs = np.zeros(batch + (nt, N2), dtype=self.dtype)
+        prob = np.zeros(batch + (nt, self.N), dtype=np.finfo(self.dtype).dtype)
+
+        for sample_index, (_, psi, probs_pos) in enumerate(self.stream(times, resume=resume)):
+            vecs[..., sample_index, :] = psi
+            prob[..., sample_index, :] = probs_pos
 
+        if cache is not None:
+            cache.put(cache_key, vecs)
         return vecs, prob
+
+    def _batch_size(self):
+        if isinstance(self.Hamiltonian, (list, tuple)):
+            return len(self.Hamiltonian)
+        return len(self.Wavefunction)
+
+    def stream(self, times: np.ndarray, resume: bool = False):
+        """
+        Generator version of run: yields (t, vector, probability) for each requested step,
+        holding only the current state in memory.
+        times: non-decreasing integer-like sequence of step counts
+        resume: start from the latest compatible checkpoint not beyond times[-1], skipping the steps before it
+        """
+        times = np.asarray(times, dtype=int)
+        if times.ndim != 1 or times.size == 0:
+            raise ValueError("Boy that times better be an array")
+        if np.any(np.diff(times) < 0):
+            raise ValueError("Streaming needs non-decreasing times")
+
+        if self.fastforward and self._jump_window(times) is not None:
+            yield from self._fast_forward(times)
+            return
+        if self.lightcone:
+            for t, lo, psi_window, probs_window in self.cone(times):
+                hi = lo + probs_window.shape[-1]
+                psi = np.zeros(psi_window.shape[:-1] + (2 * self.N,), dtype=psi_window.dtype)
+                psi[..., 2 * lo:2 * hi] = psi_window
+                probs_pos = np.zeros(probs_window.shape[:-1] + (self.N,))
+                probs_pos[..., lo:hi] = probs_window
+                yield t, psi, probs_pos
+            return
+
+        N = self.N
+        params64 = self._coin_params()
+        params = params64.astype(self.dtype, copy=False)
+        norm_drift = 0.0
+
+        # double buffers for the (N, 2) amplitudes, swapped after every step
+        state = self.psi0.reshape(self.psi0.shape[:-1] + (N, 2))
+        if self.batched:
+            # a single shared state or Hamiltonian is broadcast over the batch
+            state = np.broadcast_to(state, (self._batch_size(), N, 2))
+        state = state.copy()
+        spare = np.empty_like(state)
+
+        t = 0
+        saved = self._load_checkpoint()
+        self.resumed_from = None
+        if resume and saved is not None and saved[0] <= times[-1]:
+            t, state[...] = saved
+            times = times[times >= t]
+            self.resumed_from = t
+        t_saved = saved[0] if saved is not None else -1
+
+        for i, t_next in enumerate(times):
+            check = self.monitored and i % self.check_every == 0
+            if check:
+                prev, t_prev = state.copy(), t
+            # apply the walk up to the next requested step
+            if self.adaptive:
+                self._windowed(state, params, int(t_next - t))
+                t = int(t_next)
+            while t < t_next:
+                self._advance(state, spare, params)
+                state, spare = spare, state
+                t += 1
+            if check:
+                norm_drift = self._check(t, t - t_prev, prev, state, params64, norm_drift)
+            # never replace a checkpoint with an earlier state
+            if self.checkpoint is not None and t > t_saved and (i == times.size - 1 or (i + 1) % self.checkpoint_every == 0):
+                self._save_checkpoint(t, state)
+                t_saved = t
+            # position probabilities (sum over coin)
+            probs_pos = (np.abs(state)**2).sum(axis=-1)
+            yield int(t_next), state.reshape(state.shape[:-2] + (2 * N,)).copy(), probs_pos
+
+    def _checkpoint_path(self):
+        digest = hashlib.sha256()
+        for H in self._hamiltonians():
+            digest.update(H.fingerprint().encode())
+        digest.update(np.ascontiguousarray(self.psi0).tobytes())
+        return os.path.join(self.checkpoint, f"dtqw_{digest.hexdigest()[:16]}.npz")
+
+    def _fingerprints(self):
+        return ",".join(H.fingerprint() for H in self._hamiltonians())
+
+    def _load_checkpoint(self):
+        """
+        (t, state) from this run's checkpoint file, or None if there is none yet.
+        """
+        if self.checkpoint is None or not os.path.exists(self._checkpoint_path()):
+            return None
+        with np.load(self._checkpoint_path()) as data:
+            if str(data["fingerprint"]) != self._fingerprints():
+                return None
+            return int(data["t"]), data["state"].astype(self.dtype)
+
+    def _save_checkpoint(self, t: int, state: np.ndarray):
+        # written next to the target and renamed, so a killed job never leaves a truncated checkpoint
+        path = self._checkpoint_path()
+        os.makedirs(self.checkpoint, exist_ok=True)
+        tmp = path[:-len(".npz")] + ".tmp.npz"
+        np.savez_compressed(tmp, state=state, t=t, fingerprint=self._fingerprints())
+        os.replace(tmp, path)
+
+    def _check(self, t: int, steps: int, prev: np.ndarray, state: np.ndarray, params: np.ndarray, norm_drift: float):
+        """
+        Redo the last `steps` steps from prev in double precision (full lattice, double-precision coins),
+        log how far the single-precision state strayed and return the updated accumulated norm drift.
+        """
+        ref = prev.astype(np.complex128)
+        spare = np.empty_like(ref)
+        for _ in range(steps):
+            self._advance(ref, spare, params)
+            ref, spare = spare, ref
+
+        axes = (-2, -1)
+        norm_ref = np.sqrt((np.abs(ref)**2).sum(axis=axes))
+        norm = np.sqrt((np.abs(state)**2).sum(axis=axes))
+        norm_drift += float(np.max(np.abs(norm**2 - norm_ref**2)))
+        error = float(np.max(np.sqrt((np.abs(state - ref)**2).sum(axis=axes)) / norm_ref))
+        self.drift.append((t, norm_drift, error))
+        if error > self.drift_tol or norm_drift > self.drift_tol:
+            warnings.warn(f"Single-precision drift at step {t}: norm {norm_drift:.2e}, step error {error:.2e}")
+        return norm_drift
+
+    def finalState(self, steps: int, region: tuple = None, tol: float = 1e-8, check: int = 8):
+        """
+        Walk straight to `steps` without keeping the intermediate states.
+        With region = (lo, hi) around the scatterer the state is inspected every `check` steps and the walk stops
+        early once the packet has been through the region and left it: less than tol of the probability inside
+        and the reflected (sites < lo) and transmitted (sites >= hi) parts changing by less than tol.
+        Returns (vector, probability, t) with t the step actually reached; a batch stops when all its states have.
+        """
+        if region is None:
+            times = np.array([steps])
+        else:
+            times = np.append(np.arange(check, steps, check), steps)
+
+        entered = False
+        sides = None
+        for t, psi, probs_pos in self.stream(times):
+            if region is None:
+                break
+            lo, hi = region
+            inside = probs_pos[..., lo:hi].sum(axis=-1).max()
+            previous = sides
+            sides = np.stack([probs_pos[..., :lo].sum(axis=-1), probs_pos[..., hi:].sum(axis=-1)], axis=-1)
+            entered = entered or inside > tol
+            if entered and inside < tol and previous is not None and np.abs(sides - previous).max() < tol:
+                break
+
+        return psi, probs_pos, t
+
+    def cone(self, times: np.ndarray):
+        """
+        Light-cone restricted stream: yields (t, lo, vector, probability) where vector and probability
+        only cover sites lo .. lo + len(probability) - 1, the causal window of the initial support.
+        Steps cost O(window) and the buffers are sized by times[-1], never by the lattice,
+        so the total cost is O(T^2) however large N is.
+        """
+        times = np.asarray(times, dtype=int)
+        if times.ndim != 1 or times.size == 0:
+            raise ValueError("Boy that times better be an array")
+        if np.any(np.diff(times) < 0):
+            raise ValueError("Streaming needs non-decreasing times")
+
+        N = self.N
+        psi0 = self.psi0.reshape(self.psi0.shape[:-1] + (N, 2))
+        support = np.flatnonzero(np.abs(psi0).reshape(-1, N, 2).max(axis=(0, 2)) > 0)
+        lo, hi = int(support[0]), int(support[-1]) + 1
+
+        # everything the walk can reach by the last requested step
+        base = max(lo - int(times[-1]), 0)
+        top = min(hi + int(times[-1]), N)
+        params = self._coin_params(np.arange(base, top)).astype(self.dtype, copy=False)
+
+        state = psi0[..., base:top, :]
+        if self.batched:
+            state = np.broadcast_to(state, (self._batch_size(),) + state.shape[-2:])
+        state = state.copy()
+        spare = np.zeros_like(state)
+
+        t = 0
+        for t_next in times:
+            while t < t_next:
+                lo, hi = max(lo - 1, 0), min(hi + 1, N)
+                a, b = lo - base, hi - base
+                self._advance(state[..., a:b, :], spare[..., a:b, :], self._sites(params, a, b))
+                state, spare = spare, state
+                t += 1
+            window = state[..., lo - base:hi - base, :]
+            yield int(t_next), lo, window.reshape(window.shape[:-2] + (-1,)).copy(), (np.abs(window)**2).sum(axis=-1)
+
+    def _windowed(self, state: np.ndarray, params: np.ndarray, steps: int):
+        """
+        Apply `steps` steps in place on the (N, 2) state, only on the active region.
+        A walker moves at most one site per step, so a window of support +- k sites is exact for k steps.
+        """
+        N = self.N
+        while steps > 0:
+            amplitude = np.abs(state).reshape(-1, N, 2).max(axis=(0, 2))
+            support = np.flatnonzero(amplitude > self.threshold)
+            if support.size == 0:
+                break
+            # drop the sub-threshold tail that would otherwise stay frozen outside the window
+            state[..., :support[0], :] = 0.0
+            state[..., support[-1] + 1:, :] = 0.0
+
+            k = min(self.margin, steps)
+            lo = max(support[0] - k, 0)
+            hi = min(support[-1] + k + 1, N)
+            window = state[..., lo:hi, :].copy()
+            window_params = self._sites(params, lo, hi)
+            spare = np.empty_like(window)
+            for _ in range(k):
+                self._advance(window, spare, window_params)
+                window, spare = spare, window
+            state[..., lo:hi, :] = window
+            steps -= k
+
+    def _jump_window(self, times: np.ndarray):
+        """
+        Sites (lo, hi) the walk can reach by the last requested step, or None when that causal window is too
+        large to fast-forward (see JUMP_DIM, JUMP_RATIO) and the matrix-free stepper should be used instead.
+        """
+        N = self.N
+        steps = int(times[-1])
+        support = np.flatnonzero(np.abs(self.psi0).reshape(-1, N, 2).max(axis=(0, 2)) > 0)
+        if support.size == 0:
+            return None
+        lo, hi = max(int(support[0]) - steps, 0), min(int(support[-1]) + 1 + steps, N)
+        dim = 2 * (hi - lo)
+        if dim > JUMP_DIM or dim**2 > JUMP_RATIO * steps:
+            return None
+        return lo, hi
+
+    def _fast_forward(self, times: np.ndarray):
+        N = self.N
+        lo, hi = window = self._jump_window(times)
+        hams = self.Hamiltonian if isinstance(self.Hamiltonian, (list, tuple)) else [self.Hamiltonian]
+        psi0 = self.psi0.reshape(-1, 2 * N)[:, 2 * lo:2 * hi]
+        if len(hams) > 1:
+            psi0 = np.broadcast_to(psi0, (len(hams), psi0.shape[-1]))
+            jumpers = [_Jumper(H, psi0[b:b + 1], window) for b, H in enumerate(hams)]
+        else:
+            jumpers = [_Jumper(hams[0], psi0, window)]
+
+        for t in times:
+            psi = np.zeros((psi0.shape[0], 2 * N), dtype=complex)
+            psi[:, 2 * lo:2 * hi] = np.concatenate([jumper(int(t)) for jumper in jumpers])
+            if not self.batched:
+                psi = psi[0]
+            probs_pos = (np.abs(psi.reshape(psi.shape[:-1] + (N, 2)))**2).sum(axis=-1)
+            yield int(t), psi, probs_pos
+
+
+class _Jumper:
+    """
+    States U^t psi0 for one Hamiltonian and a (b, 2W) block of initial states on the sites window = (lo, hi),
+    at non-decreasing t.
+    """
+    def __init__(self, Hamiltonian, psi0: np.ndarray, window: tuple):
+        self.Hamiltonian = Hamiltonian
+        self.window = window
+        try:
+            self.lam, self.V, V_inv = Hamiltonian.eigensystem(window=window)
+            self.coeffs = V_inv @ psi0.T
+        except np.linalg.LinAlgError:
+            self.lam = None
+            self.t = 0
+            self.psi = psi0.T.copy()
+
+    def __call__(self, t: int):
+        if self.lam is not None:
+            return (self.V @ (self.lam[:, None]**t * self.coeffs)).T
+        self.psi = self.Hamiltonian.applyPower(t - self.t, self.psi, self.window)
+        self.t = t
+        return self.psi.T
@@ -0,0 +1,99 @@
+import numpy as np
+import Core
+from concurrent.futures import ProcessPoolExecutor
+
+
+def randomCoins(rng: np.random.Generator, realizations: int, Num_sites: int, disorder: str = "phase", strength: float = np.pi):
+    """
+    Per-site coin blocks (realizations, N, 2, 2) drawn from rng.
+    disorder == "phase": Hadamard times e^{i phi_j} with phi_j uniform in [-strength, strength]
+    disorder == "su2":   Haar-random SU(2) coin at every site (strength is ignored)
+    """
+    shape = (realizations, Num_sites)
+    if disorder == "phase":
+        hadamard = (1 / np.sqrt(2)) * np.array([[1, 1], [1, -1]], dtype=complex)
+        phases = rng.uniform(-strength, strength, size=shape)
+        return np.exp(1j * phases)[..., None, None] * hadamard
+    if disorder == "su2":
+        # a normalized Gaussian quaternion is Haar distributed on SU(2)
+        q = rng.standard_normal(shape + (4,))
+        q /= np.linalg.norm(q, axis=-1, keepdims=True)
+        a = q[..., 0] + 1j * q[..., 3]
+        b = q[..., 2] + 1j * q[..., 1]
+        return np.stack([np.stack([a, b], axis=-1), np.stack([-b.conj(), a.conj()], axis=-1)], axis=-2)
+    raise ValueError(f"Unknown disorder {disorder!r}")
+
+
+def _run_chunk(args):
+    """
+    Evolve one chunk of realizations as a single batch and return its running sums.
+    """
+    N, center, times, realizations, disorder, strength, seed, coin_init, precision = args
+    rng = np.random.default_rng(seed)
+    coins = randomCoins(rng, realizations, N, disorder, strength)
+
+    Hs = []
+    for c in coins:
+        H = Core.Hamiltonian(N)
+        H.setCoins(c)
+        Hs.append(H)
+    Psi = Core.Wavefunction(gaussian=False, Num_sites=N, center=center, coin_init=coin_init)
+    Evo = Core.Evolver(Hs, Psi, precision=precision)
+
+    x = np.arange(N)
+    nt = len(times)
+    sums = {"prob": np.zeros((nt, N)), "prob_sq": np.zeros((nt, N)), "variance": np.zeros(nt), "ipr": np.zeros(nt)}
+    for i, (_, _, prob) in enumerate(Evo.stream(times)):
+        norm = prob.sum(axis=-1)
+        mean = (prob * x).sum(axis=-1) / norm
+        sums["prob"][i] = prob.sum(axis=0)
+        sums["prob_sq"][i] = (prob**2).sum(axis=0)
+        sums["variance"][i] = ((prob * (x - mean[:, None])**2).sum(axis=-1) / norm).sum()
+        sums["ipr"][i] = ((prob**2).sum(axis=-1) / norm**2).sum()
+    return sums
+
+
+def ensemble(Num_sites: int, center: int, times: np.ndarray, realizations: int, disorder: str = "phase",
+             strength: float = np.pi, seed: int = 0, chunk: int = 64, workers: int = None,
+             coin_init: np.ndarray = np.array([1.0, 0.0 + 1.0j], dtype=complex) / np.sqrt(2), precision: str = "double"):
+    """
+    Ensemble average of a localized DTQW over random coin realizations.
+    Realizations are evolved `chunk` at a time as one vectorized batch, chunks are spread over a
+    process pool (workers=0 runs them in this process), and only running sums are kept.
+    Each chunk gets its own child of SeedSequence(seed), so results do not depend on `workers`.
+    precision="single" steps the realizations in complex64, enough for ensemble averages.
+    Returns a dict with
+      - "prob":     mean position distribution (nt, N)
+      - "prob_var": ensemble variance of the distribution (nt, N)
+      - "variance": mean spatial variance of the walker (nt,)
+      - "ipr":      mean inverse participation ratio (nt,)
+    """
+    times = np.asarray(times, dtype=int)
+    sizes = [min(chunk, realizations - start) for start in range(0, realizations, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(Num_sites, center, times, size, disorder, strength, s, coin_init, precision) for size, s in zip(sizes, seeds)]
+
+    totals = None
+    if workers == 0:
+        results = map(_run_chunk, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_run_chunk, tasks)
+    try:
+        for sums in results:
+            if totals is None:
+                totals = sums
+            else:
+                for key in totals:
+                    totals[key] += sums[key]
+    finally:
+        if workers != 0:
+            pool.shutdown()
+
+    mean = totals["prob"] / realizations
+    return {
+        "prob": mean,
+        "prob_var": totals["prob_sq"] / realizations - mean**2,
+        "variance": totals["variance"] / realizations,
+        "ipr": totals["ipr"] / realizations,
+    }
@@ -0,0 +1,98 @@
+import numpy as np
+
+_HADAMARD = (1 / np.sqrt(2)) * np.array([[1, 1], [1, -1]], dtype=complex)
+
+
+def _site_transfer(lam: np.ndarray, coins: np.ndarray):
+    """
+    Transfer matrix of one site on bond amplitudes (R_q, L_q) -> (R_{q+1}, L_{q+1}), where
+    R_q = phi_{q-1,0} is the right-mover arriving at q and L_q = phi_{q,1} the left-mover leaving it
+    (phi = coin applied to psi). At quasi-energy lam the site scatters (R_q, L_{q+1}) into
+    (R_{q+1}, L_q) with S = coin / lam, which is solved for the right-hand bond.
+    """
+    S = coins / lam[..., None, None]
+    T = np.empty(S.shape, dtype=complex)
+    T[..., 0, 0] = S[..., 0, 0] * S[..., 1, 1] - S[..., 0, 1] * S[..., 1, 0]
+    T[..., 0, 1] = S[..., 0, 1]
+    T[..., 1, 0] = -S[..., 1, 0]
+    T[..., 1, 1] = 1.0
+    return T / S[..., 1, 1, None, None]
+
+
+def _bloch(k: np.ndarray):
+    """
+    Quasi-energy factor lam = e^{-i omega} of the right-moving Hadamard Bloch wave with bond amplitudes
+    ~ e^{i k q}, and the flux-normalized bond eigenvectors P = [right, left] with multipliers mu = (e^{ik}, -e^{-ik}).
+    Both branches sin(omega) = sin(k) / sqrt(2) carry e^{ik}, the one with positive flux is the right-mover.
+    """
+    omega = np.arcsin(np.sin(k) / np.sqrt(2))
+    mu = np.stack([np.exp(1j * k), -np.exp(-1j * k)], axis=-1)
+
+    def vectors(omega):
+        lam = np.exp(-1j * omega)
+        # eigenvectors (1, sqrt(2) / lam - mu) of the free transfer matrix [[sqrt(2) / lam, -1], [1, -sqrt(2) lam]]
+        lower = np.sqrt(2) / lam[..., None] - mu
+        return lam, np.abs(lower[..., 0])**2
+
+    lam, lower = vectors(omega)
+    omega = np.where(1.0 - lower > 0, omega, np.pi - omega)
+    lam = np.exp(-1j * omega)
+
+    P = np.empty(k.shape + (2, 2), dtype=complex)
+    P[..., 0, :] = 1.0
+    P[..., 1, :] = np.sqrt(2) / lam[..., None] - mu
+    flux = np.abs(P[..., 0, :])**2 - np.abs(P[..., 1, :])**2
+    P /= np.sqrt(np.abs(flux))[..., None, :]
+    return lam, mu, P
+
+
+def transfer(k, def_sites, coins):
+    """
+    (T, R) for arbitrary 2x2 coins (..., m, 2, 2) replacing the Hadamard at def_sites (m,),
+    for a right-moving Bloch wave of wavenumber k (any shape K, cos k != 0 away from the band edges).
+    Returns arrays of shape (...,) + K.
+    """
+    k = np.asarray(k, dtype=float)
+    sites = np.asarray(def_sites, dtype=int)
+    coins = np.asarray(coins, dtype=complex)
+    if coins.shape[-3:] != sites.shape + (2, 2):
+        raise ValueError("Need one 2x2 coin per defect site")
+
+    lam, mu, P = _bloch(k)
+    P_inv = np.linalg.inv(P)
+    lead = coins.shape[:-3]
+    k_axes = (None,) * k.ndim
+    M = np.broadcast_to(np.eye(2, dtype=complex), lead + k.shape + (2, 2)).copy()
+
+    # free stretches are diagonal in the Bloch basis, so only the defects cost anything
+    for j in np.argsort(sites):
+        s = sites[j]
+        T = _site_transfer(lam, coins[(..., j) + k_axes + (slice(None), slice(None))])
+        Q = P_inv @ T @ P
+        Q *= mu[..., None, :]**s / mu[..., :, None]**(s + 1)
+        M = Q @ M
+
+    # incoming 1 and reflected r on the left, transmitted t only on the right: (t, 0) = M (1, r)
+    r = -M[..., 1, 0] / M[..., 1, 1]
+    t = M[..., 0, 0] + M[..., 0, 1] * r
+    return np.abs(t)**2, np.abs(r)**2
+
+
+def coefficients(k, def_sites, defect_str):
+    """
+    Exact stationary (T, R) of the Hadamard walk with phase defects e^{i defect_str} at def_sites,
+    vectorized over k (shape K) and defect phases (..., m); the result has shape (...,) + K and T + R = 1.
+    Cost is O(m) per k and phase set, independent of the lattice size.
+    """
+    phases = np.asarray(defect_str, dtype=float)
+    return transfer(k, def_sites, np.exp(1j * phases)[..., None, None] * _HADAMARD)
+
+
+def fromHamiltonian(Hamiltonian, k):
+    """
+    (T, R) at wavenumbers k for the phase defects of a Core.Hamiltonian.
+    """
+    if Hamiltonian.base is not None or Hamiltonian.absorber.any():
+        raise ValueError("Stationary scattering needs Hadamard coins without absorber")
+    sites = list(Hamiltonian.defects)
+    return coefficients(k, sites, [Hamiltonian.defects[s] for s in sites])
@@ -0,0 +1,64 @@
+import numpy as np
+import Cache  # puts the repository root, home of the shared Common package, on the import path
+import Core
+import Plotting
+from Common import Scenarios
+
+
+def load(path: str):
+    """
+    Scenario list from a JSON or TOML file (by extension) with a top-level "scenario" array, e.g.
+
+        [[scenario]]
+        name = "Reflection_Combined_DTQW"
+        N = 1001
+        times = {t_max = 500}
+        walks = [{defects = {sites = [], phases = []}, state = {gaussian = false, center = 500}},
+                 {defects = {sites = [600], phases = [1.5708]}, state = {gaussian = false, center = 500}}]
+        stages = [{kind = "prob", ylim = 0.1}]
+
+    defects may also carry absorber = {width, strength}; state takes the Core.Wavefunction keywords,
+    with coin_init as [[re, im], [re, im]]; times are {t_max, num} with num = t_max + 1 by default.
+    """
+    return Scenarios.load(path)
+
+
+def plan(scenarios):
+    """
+    Common.Scenarios.plan with the defects keyed on their per-site phases.
+    """
+    return Scenarios.plan(scenarios, "phases")
+
+
+def buildHamiltonian(N: int, spec: dict):
+    H = Core.Hamiltonian(N)
+    if spec.get("sites"):
+        H.addDefects(spec["sites"], spec["phases"])
+    if "absorber" in spec:
+        H.addAbsorber(**spec["absorber"])
+    return H
+
+
+def buildState(N: int, spec: dict):
+    spec = dict(spec)
+    if "coin_init" in spec:
+        spec["coin_init"] = np.array([complex(re, im) for re, im in spec["coin_init"]])
+    return Core.Wavefunction(Num_sites=N, **spec)
+
+
+def _prob_stage(name, times, vectors, probs, ylim: float = 0.1):
+    Plotting.ProbDistAnimate(np.stack(probs), times, name, ylim)
+
+# stage kind -> f(name, times, vectors, probabilities, **options), one entry of each list per walk
+STAGES = {
+    "prob": _prob_stage,
+}
+
+
+def run(scenarios, workers: int = None, stages: bool = True):
+    """
+    Common.Scenarios.run with the DTQW builders and STAGES: every unique Hamiltonian, initial state and
+    evolution is computed once. Returns {name: {"times", "vectors", "probability"}}.
+    """
+    return Scenarios.run(scenarios, "phases", Core.Evolver, buildHamiltonian, buildState, STAGES, workers,
+                         stages)
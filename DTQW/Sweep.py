@@ -0,0 +1,25 @@
+import copy
+import Cache  # puts the repository root, home of the shared Common package, on the import path
+from Common import Sweep
+from Common.Sweep import gridPoints, refine
+
+# array attributes of Hamiltonian / Wavefunction that travel through shared memory instead of pickles
+_SHARED = {"Hamiltonian": ("phases", "absorber", "base"), "Wavefunction": ("psi",)}
+
+
+def _skeleton(H):
+    # U and the fast-forward caches are derived from the coins, the workers rebuild them lazily
+    H = copy.copy(H)
+    H._U = None
+    H._eigs = None
+    H._powers = (-1, [])
+    return H
+
+
+def sweep(evaluate, grid, Hamiltonian, Wavefunction, workers: int = None, chunksize: int = 1):
+    """
+    Common.Sweep.sweep for the DTQW: the base coin parameters and initial state are placed in shared memory
+    once instead of being pickled per task. Returns (results, timing).
+    """
+    return Sweep.sweep(evaluate, grid, Hamiltonian, Wavefunction, _SHARED, _skeleton, "dtqw-sweep", workers,
+                       chunksize)
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def boundModes(Hamiltonian, region: tuple, threshold: float = 0.5):
+    """
+    Eigenmodes of U holding more than `threshold` of their (normalized) probability inside region = (lo, hi),
+    i.e. the bound and quasi-bound states of a trap. Quasi-bound modes leak through the defects and
+    have |lam| < 1, bound ones keep |lam| = 1.
+    Returns (indices, lam, weights) with indices into the columns of V from Hamiltonian.eigensystem().
+    """
+    lo, hi = region
+    lam, V, _ = Hamiltonian.eigensystem()
+    weights = (np.abs(V[2*lo:2*hi])**2).sum(axis=0) / (np.abs(V)**2).sum(axis=0)
+    indices = np.flatnonzero(weights > threshold)
+    return indices, lam[indices], weights[indices]
+
+
+def trappedProbability(Hamiltonian, Wavefunction, region: tuple, times=None, threshold: float = 0.5,
+                       decay_tol: float = 1e-6, degeneracy: float = 1e-9):
+    """
+    Probability kept inside region = (lo, hi) by the bound modes, from the overlaps c = V^-1 psi of the
+    initial state instead of a long-time evolution. With P the projector on the region,
+
+        P_trap(t) = sum_{k,l} c_k c_l^* lam_k^t lam_l^*t <v_l|P|v_k>
+
+    The walker leaves through the open ends, so only modes with |lam| = 1 (within decay_tol) survive;
+    their time average keeps the pairs with lam_k = lam_l (within `degeneracy`).
+    Returns a dict with
+        "average":  infinite-time average of the trapped probability
+        "initial":  the bound and quasi-bound modes' share of the region at t = 0
+        "curve":    P_trap at the integer steps `times`, quasi-bound modes decaying as |lam|^2t (None without times);
+                    it follows the evolution once the untrapped part and the resonances below threshold have left
+        "modes", "lam", "weights", "overlaps": the modes as found by boundModes()
+    """
+    lo, hi = region
+    indices, lam, weights = boundModes(Hamiltonian, region, threshold)
+    _, V, V_inv = Hamiltonian.eigensystem()
+    inside = V[2*lo:2*hi, indices]
+    overlaps = V_inv[indices] @ Wavefunction.psi.astype(complex)
+
+    gram = inside.conj().T @ inside
+    survives = np.abs(lam) >= 1.0 - decay_tol
+    same = (np.abs(lam[:, None] - lam[None, :]) < degeneracy) & survives[:, None] & survives[None, :]
+    average = np.real(overlaps.conj() @ (same * gram) @ overlaps)
+    initial = np.real(overlaps.conj() @ gram @ overlaps)
+
+    curve = None
+    if times is not None:
+        phases = lam ** np.asarray(times, dtype=int)[:, None] * overlaps
+        curve = (np.abs(phases @ inside.T)**2).sum(axis=-1)
+
+    return {"average": average, "initial": initial, "curve": curve,
+            "modes": indices, "lam": lam, "weights": weights, "overlaps": overlaps}
@@ -1,41 +1,42 @@
 import numpy as np
 import matplotlib.pyplot as plt
+import Cache
 import Core
+import Disorder
 import Plotting
+import Scattering
+import Sweep
+import Trapping
 from pathlib import Path
-from tqdm import tqdm
 
 
 def defect_str_origin():
     N = 201
     center = 150
     t_max = 30
-    times = np.linspace(0, t_max, t_max + 1, dtype = int)
     dir = Path("PlotAnalysis")
     dir.mkdir(parents = True, exist_ok = True)
     path = dir / "Defect_Origin.png"
 
-    defect_range = np.linspace(-np.pi, np.pi, 30)
-    prob_origin_balanced = []
-    prob_origin_0 = []
-    prob_origin_1 = []
     coin_state = np.array([np.array([1.0, 0.0 + 1.0j], dtype=complex) / np.sqrt(2), np.array([1.0, 0.0 + 0.0j], dtype=complex), np.array([0.0, 1.0 + 0.0j], dtype=complex)])
+    Psis = [Core.Wavefunction(gaussian = False, Num_sites= N, center = center, coin_init = coin) for coin in coin_state]
 
-    for defect in tqdm(defect_range, desc = "Origin Strength Test"):
-        for i in range(3):
-            H_defected = Core.Hamiltonian(N)
-            H_defected.addDefects([center], defect)
+    def origin(defect_range):
+        H_defected = []
+        for defect in defect_range:
+            H = Core.Hamiltonian(N)
+            H.addDefects([center], defect)
+            H_defected.append(H)
 
-            Psi = Core.Wavefunction(gaussian = False, Num_sites= N, center = center, coin_init = coin_state[i])
-            Evo = Core.Evolver(H_defected, Psi)
+        # every (defect, coin) pair advances together as one batch, defect-major
+        Evo = Core.Evolver([H for H in H_defected for _ in Psis], [Psi for _ in H_defected for Psi in Psis])
+        _, prob, _ = Evo.finalState(t_max)
+        return prob[:, center].reshape(len(defect_range), len(Psis))
 
-            _, prob = Evo.run(times)
-            if i == 0:
-                prob_origin_balanced.append(prob[-1][center])
-            elif i == 1:
-                prob_origin_0.append(prob[-1][center])
-            elif i == 2:
-                prob_origin_1.append(prob[-1][center])
+    # refined where any of the three curves is steep or bends
+    defect_range, prob_origin = Sweep.refine(origin, -np.pi, np.pi, initial = 9, tol = 1e-2, max_step = 0.05,
+                                             max_points = 30)
+    prob_origin_balanced, prob_origin_0, prob_origin_1 = prob_origin.T
 
     fig, ax = plt.subplots(figsize = (12, 10))
     ax.set_title("Probability at Origin vs Defect Strength", fontsize = 16)
@@ -53,32 +54,29 @@ def transmission_prob():
     center = 150
     defect_distance = 15
     t_max = 30
-    times = np.linspace(0, t_max, t_max + 1, dtype = int)
     dir = Path("PlotAnalysis")
     dir.mkdir(parents = True, exist_ok = True)
     path = dir / "Transmission.png"
 
-    defect_range = np.linspace(-np.pi, np.pi, 30)
-    prob_origin_balanced = []
-    prob_origin_0 = []
-    prob_origin_1 = []
     coin_state = np.array([np.array([1.0, 0.0 + 1.0j], dtype=complex) / np.sqrt(2), np.array([1.0, 0.0 + 0.0j], dtype=complex), np.array([0.0, 1.0 + 0.0j], dtype=complex)])
+    Psis = [Core.Wavefunction(gaussian = False, Num_sites= N, center = center, coin_init = coin) for coin in coin_state]
+    site = center + defect_distance
 
-    for defect in tqdm(defect_range, desc = "Transmission Test"):
-        for i in range(3):
-            H_defected = Core.Hamiltonian(N)
-            H_defected.addDefects([center + defect_distance], defect)
+    def transmitted(defect_range):
+        H_defected = []
+        for defect in defect_range:
+            H = Core.Hamiltonian(N)
+            H.addDefects([site], defect)
+            H_defected.append(H)
 
-            Psi = Core.Wavefunction(gaussian = False, Num_sites= N, center = center, coin_init = coin_state[i])
-            Evo = Core.Evolver(H_defected, Psi)
+        # every (defect, coin) pair advances together as one batch, defect-major
+        Evo = Core.Evolver([H for H in H_defected for _ in Psis], [Psi for _ in H_defected for Psi in Psis])
+        _, prob, _ = Evo.finalState(t_max, region = (site - 5, site + 6), tol = 1e-6)
+        return prob[:, site:].sum(axis = 1).reshape(len(defect_range), len(Psis))
 
-            _, prob = Evo.run(times)
-            if i == 0:
-                prob_origin_balanced.append(prob[-1][center + defect_distance:].sum())
-            elif i == 1:
-                prob_origin_0.append(prob[-1][center + defect_distance:].sum())
-            elif i == 2:
-                prob_origin_1.append(prob[-1][center + defect_distance:].sum())
+    defect_range, transmission = Sweep.refine(transmitted, -np.pi, np.pi, initial = 9, tol = 1e-2, max_step = 0.1,
+                                              max_points = 30)
+    prob_origin_balanced, prob_origin_0, prob_origin_1 = transmission.T
 
     fig, ax = plt.subplots(figsize = (12, 10))
     ax.set_title("Transmission Probability vs Defect Strength", fontsize = 16)
@@ -95,13 +93,15 @@ def trapping():
     N = 501
     defect_sites = [200, 300]
     defect_phase = np.pi/1.2
+    region = (200, 300)
 
     dir = Path("PlotAnalysis")
     dir.mkdir(parents = True, exist_ok = True)
     path = dir / "Trapped.png"
 
     center = 250
-    t_max = 550
+    t_max = 5000
+    t_short = 550
     times = np.arange(0, t_max + 1, dtype=int)
 
     H_defected = Core.Hamiltonian(N)
@@ -109,19 +109,70 @@ def trapping():
 
     Psi = Core.Wavefunction(gaussian=False, Num_sites=N, center=center)
 
+    # only the first t_short steps are evolved, the long-time tail comes from the trap's eigenmodes;
+    # the low threshold keeps the faster resonances too, so the two agree from a few hundred steps on
     Evo_defected = Core.Evolver(H_defected, Psi)
+    vecs_defected, prob_defected = Evo_defected.run(times[:t_short + 1])
+    trap = Trapping.trappedProbability(H_defected, Psi, region, times = times, threshold = 0.1)
 
-    vecs_defected, prob_defected = Evo_defected.run(times)
-
-    trapped_prob = prob_defected[:, 200:300].sum(axis = 1)
+    trapped_prob = prob_defected[:, region[0]:region[1]].sum(axis = 1)
     fig, ax = plt.subplots(figsize = (10, 10))
     ax.set_title("Trapped Probability vs Time", fontsize = 16)
-    ax.plot(times, trapped_prob)
+    ax.plot(times[:t_short + 1], trapped_prob, label = "Evolution")
+    ax.plot(times, trap["curve"], linestyle = "dashed", label = "Quasi-bound Modes")
+    ax.axhline(trap["average"], color = "black", linestyle = "dotted", label = "Asymptotic")
     ax.set_xlabel("Time")
     ax.set_ylabel("Probability")
     ax.grid(True)
+    ax.legend()
+    plt.savefig(path, bbox_inches = "tight")
+
+def transmission_spectrum():
+    dir = Path("PlotAnalysis")
+    dir.mkdir(parents = True, exist_ok = True)
+    path = dir / "Transmission_spectrum.png"
+
+    # exact T(k) of a single phase defect for every (phase, k) pair in one vectorized call
+    k = np.linspace(-np.pi, np.pi, 600)
+    k = k[np.abs(np.cos(k)) > 1e-3]
+    defect_range = np.linspace(-np.pi, np.pi, 300)
+    transmission, _ = Scattering.coefficients(k, [0], defect_range[:, None])
+
+    fig, ax = plt.subplots(figsize = (12, 10))
+    ax.set_title("Stationary Transmission vs Defect Phase and Momentum", fontsize = 16)
+    mesh = ax.pcolormesh(k, defect_range, transmission, shading = "auto", vmin = 0.0, vmax = 1.0)
+    fig.colorbar(mesh, ax = ax, label = "Transmission Probability")
+    ax.set_xlabel("Momentum")
+    ax.set_ylabel("Defect Strength")
+    plt.savefig(path, bbox_inches = "tight")
+
+def disorder_localization():
+    N = 201
+    center = 100
+    t_max = 100
+    times = np.arange(0, t_max + 1, dtype=int)
+    realizations = 1000
+
+    dir = Path("PlotAnalysis")
+    dir.mkdir(parents = True, exist_ok = True)
+    path = dir / "Disorder.png"
+
+    result = Disorder.ensemble(N, center, times, realizations, disorder = "phase", strength = np.pi, seed = 0)
+
+    fig, (ax_dist, ax_ipr) = plt.subplots(1, 2, figsize = (16, 8))
+    ax_dist.set_title("Ensemble Averaged Distribution at t = %d" % t_max, fontsize = 16)
+    ax_dist.plot(np.arange(N), result["prob"][-1])
+    ax_dist.set_xlabel("Lattice")
+    ax_dist.set_ylabel("Probability")
+    ax_dist.grid(True)
+    ax_ipr.set_title("Ensemble Averaged IPR vs Time", fontsize = 16)
+    ax_ipr.plot(times, result["ipr"])
+    ax_ipr.set_xlabel("Time")
+    ax_ipr.set_ylabel("IPR")
+    ax_ipr.grid(True)
     plt.savefig(path, bbox_inches = "tight")
 
 
 if __name__ == "__main__":
+    Cache.enable()
     trapping()
@@ -1,6 +1,8 @@
 import numpy as np
+import Cache
 import Core
 import Plotting
+import Scenarios
 
 def localization():
     N = 501               # number of lattice sites
@@ -73,6 +75,6 @@ def trapping():
     Plotting.ProbDistAnimate(probs, times, "Trapping_Combined_DTQW", 0.1)
 
 if __name__ == "__main__":
-    localization()
-    reflection()
-    trapping()
+    Cache.enable()
+    # the scenarios above, declared in scenarios.json so shared Hamiltonians and evolutions are built once
+    Scenarios.run(Scenarios.load("scenarios.json"))